@@ -0,0 +1,99 @@
+import os
+import numpy as np
+import pandas as pd
+from src.headers import NEIGHBORS
+
+# En-têtes au format de la feuille 'Zeitreihen0h15' (Prod/Conso en colonnes 2 et 3)
+HEADERS = (['Zeitstempel',
+            'Summe endverbrauchte Energie Regelblock Schweiz',
+            'Summe produzierte Energie Regelblock Schweiz',
+            'Summe verbrauchte Energie Regelblock Schweiz']
+           + [h for code in NEIGHBORS for h in (f'Verbundaustausch CH->{code}', f'Verbundaustausch {code}->CH')]
+           + ['Import', 'Export', 'Transit'])
+SHEET = 'Zeitreihen0h15'
+
+
+def quarter_hour_labels(year, tz='Europe/Zurich'):
+    """
+    Horodatages Swissgrid d'une année : heure locale naïve de fin d'intervalle
+    (01.01 00:15 -> 01.01 00:00 de l'année suivante), avec le quart d'heure
+    manquant au printemps et les quarts d'heure répétés à l'automne.
+    """
+    local = pd.date_range(f'{year}-01-01', f'{year + 1}-01-01', freq='15min', tz=tz, inclusive='left')
+    return local.tz_localize(None) + pd.Timedelta('15min')
+
+
+def synthetic_year(year, rng):
+    """Valeurs kWh / 15 min réalistes : saisonnalité Winter Gap, cycle journalier, bruit."""
+    labels = quarter_hour_labels(year)
+    n = len(labels)
+    phase = 2 * np.pi * labels.dayofyear.to_numpy() / 365.25
+    daily = np.sin(2 * np.pi * (labels.hour.to_numpy() + labels.minute.to_numpy() / 60 - 6) / 24)
+
+    consumption = 7000 + 1300 * np.cos(phase) + 700 * daily + rng.normal(0, 250, n)
+    production = 7200 - 1800 * np.cos(phase) + 900 * daily + rng.normal(0, 400, n)
+    flows = np.abs(rng.normal(0, 1, (n, 2 * len(NEIGHBORS)))) * [900, 700, 500, 900, 300, 1500, 400, 300]
+    imports = flows[:, 1::2].sum(axis=1)
+    exports = flows[:, 0::2].sum(axis=1)
+    transit = np.minimum(imports, exports) * rng.uniform(0.5, 0.9, n)
+
+    mw = np.column_stack([consumption * 0.97, production, consumption, flows, imports, exports, transit])
+    return labels, mw * 1000 / 4  # MW -> kWh par quart d'heure
+
+
+def write_workbook(filepath, labels, kwh):
+    """Classeur xlsx (openpyxl write-only) : en-tête, ligne des unités, puis les données."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET)
+    ws.append(HEADERS)
+    ws.append([''] + ['kWh'] * (len(HEADERS) - 1))
+    stamps = labels.strftime('%d.%m.%Y %H:%M')
+    for stamp, row in zip(stamps, kwh.round(3).tolist()):
+        ws.append([stamp] + row)
+    wb.save(filepath)
+
+
+def write_csv(filepath, labels, kwh):
+    """Même contenu au format CSV (';'), lisible par le mode flux (src.live)."""
+    table = pd.DataFrame(kwh.round(3), columns=HEADERS[1:])
+    table.insert(0, HEADERS[0], labels.strftime('%d.%m.%Y %H:%M'))
+    units = pd.DataFrame([[''] + ['kWh'] * (len(HEADERS) - 1)], columns=HEADERS)
+    pd.concat([units, table]).to_csv(filepath, sep=';', index=False)
+
+
+def write_prices(filepath, years, rng):
+    """Prix spot journaliers (format 'Datum,Baseload_EUR_MWh' du fichier OpenData)."""
+    days = pd.date_range(f'{years[0]}-01-01', f'{years[-1]}-12-31', freq='D')
+    phase = 2 * np.pi * days.dayofyear.to_numpy() / 365.25
+    price = 90 + 35 * np.cos(phase) + rng.normal(0, 15, len(days))
+    pd.DataFrame({'Datum': days.strftime('%Y-%m-%d'), 'Baseload_EUR_MWh': price.round(2)}).to_csv(filepath, index=False)
+
+
+def build_fixtures(root, n_years, first_year=2006, seed=0):
+    """
+    Jeu de données synthétique de `n_years` années dans root/<n>y/ (réutilisé s'il existe).
+    Renvoie (classeurs xlsx, CSV 15 min, fichier de prix).
+    """
+    directory = os.path.join(root, f'{n_years}y')
+    os.makedirs(directory, exist_ok=True)
+    years = list(range(first_year, first_year + n_years))
+    rng = np.random.default_rng(seed)
+    workbooks, csvs = [], []
+    for year in years:
+        xlsx = os.path.join(directory, f'swissgrid_{year}.xlsx')
+        csv = os.path.join(directory, f'swissgrid_{year}.csv')
+        labels, kwh = synthetic_year(year, rng)
+        if not os.path.exists(xlsx):
+            print(f"   -> Génération {xlsx}")
+            write_workbook(xlsx, labels, kwh)
+        if not os.path.exists(csv):
+            write_csv(csv, labels, kwh)
+        workbooks.append(xlsx)
+        csvs.append(csv)
+
+    prices = os.path.join(directory, 'prices.csv')
+    if not os.path.exists(prices):
+        write_prices(prices, years, rng)
+    return workbooks, csvs, prices
@@ -0,0 +1,170 @@
+"""
+Benchmarks du pipeline sur des classeurs Swissgrid synthétiques (1, 5, 20 ans).
+
+    python -m benchmarks.run                          # 1, 5 et 20 ans -> benchmarks/results.json
+    python -m benchmarks.run --years 1 --compare benchmarks/baseline.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import itertools
+from contextlib import contextmanager, redirect_stdout
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import build_fixtures
+from src.loader import MultiYearLoader
+from src.analyzer import WinterGapAnalyzer
+from src.advanced_stats import AdvancedAnalyzer
+from src.sensitivity import SensitivityRunner, grid
+from src.live import LiveAggregator, open_feed, parse_records
+from src.rendering import DEFAULT_PLOTS, configure_headless, render
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '.fixtures')
+
+
+class StageTimer:
+    """Chronométrage des étapes (sortie console des étapes masquée)."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            yield
+        self.timings[name] = round(time.perf_counter() - start, 4)
+        print(f"   {name:<40} {self.timings[name]:>9.3f} s")
+
+
+def bench_dataset(n_years, workers=None, plots=None):
+    print(f"\n--- BENCHMARK {n_years} an(s) ---")
+    workbooks, csvs, prices = build_fixtures(FIXTURES_DIR, n_years)
+    timer = StageTimer()
+
+    # 1. Chargement (les étapes du Loader, une par une)
+    loader = MultiYearLoader(workbooks, prices, workers=workers, use_cache=False)
+    with timer.stage('excel_parse'):
+        df15 = loader._read_swissgrid_15min()
+    cached = MultiYearLoader(workbooks, prices, workers=workers, use_cache=True)
+    with redirect_stdout(io.StringIO()):
+        cached._read_swissgrid_15min()  # remplissage du cache
+    with timer.stage('cache_load'):
+        cached._read_swissgrid_15min()
+    with timer.stage('hourly_aggregation'):
+        df = loader._build_power_frame(df15)
+    with timer.stage('price_merge'):
+        df = loader._merge_spot_prices(df)
+    with timer.stage('financials'):
+        df = loader._compute_financials(df).dropna(subset=['Production_MW'])
+
+    # 2. Analyses (hors tracés)
+    with timer.stage('analyzer.winter_gap_kpis'):
+        WinterGapAnalyzer(df).compute_kpis()
+    with timer.stage('analyzer.duration_curve'):
+        AdvancedAnalyzer(df).duration_curve.hours_above(0)
+    with timer.stage('analyzer.sensitivity_100'):
+        SensitivityRunner(df).run(grid(consumption_scale=np.linspace(0.9, 1.1, 10),
+                                       solar_mw=np.linspace(0, 5000, 10)))
+    with timer.stage('analyzer.live_feed'):
+        LiveAggregator(prices).consume(itertools.chain.from_iterable(
+            parse_records(open_feed(csv)) for csv in csvs))
+
+    # 3. Tracés en mode headless (un par figure du catalogue)
+    with tempfile.TemporaryDirectory() as output_dir:
+        configure_headless(output_dir)
+        for name in plots or DEFAULT_PLOTS:
+            with timer.stage(f'plot.{name}'):
+                render(df, name)
+
+    return {'rows_15min': len(df15), 'rows': len(df), 'timings': timer.timings}
+
+
+def bench_startup(repeat=3):
+    """Démarrage de la CLI dans un interpréteur neuf (meilleur de `repeat`) : imports seuls."""
+    print("\n--- BENCHMARK DÉMARRAGE CLI ---")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = {
+        'startup.cli': 'import main_real',
+        'startup.kpi': 'import main_real, src.loader, src.analyzer',
+        'startup.plot': 'import main_real, src.loader, src.analyzer, src.visualizer',
+    }
+    timings = {}
+    for name, code in paths.items():
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+            runs.append(time.perf_counter() - start)
+        timings[name] = round(min(runs), 4)
+        print(f"   {name:<40} {timings[name]:>9.3f} s")
+    return {'timings': timings}
+
+
+def compare(results, baseline, threshold):
+    """Étapes plus lentes que la référence d'un facteur > threshold. Renvoie le nombre de régressions."""
+    regressions = 0
+    print(f"\n--- COMPARAISON (seuil x{threshold}) ---")
+    for size, run in results['datasets'].items():
+        ref = baseline.get('datasets', {}).get(size)
+        if ref is None:
+            continue
+        for stage, seconds in run['timings'].items():
+            before = ref['timings'].get(stage)
+            # On ignore les étapes trop courtes pour être mesurées de façon fiable
+            if before is None or max(before, seconds) < 0.05:
+                continue
+            ratio = seconds / before
+            if ratio > threshold:
+                regressions += 1
+                print(f"⚠️ {size} {stage} : {before:.3f} s -> {seconds:.3f} s (x{ratio:.2f})")
+    if not regressions:
+        print("✅ Aucune régression.")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks Swiss Winter Gap (données synthétiques)")
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results.json'))
+    parser.add_argument('--compare', metavar='BASELINE_JSON', help="Compare à un run précédent")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Facteur de ralentissement toléré")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--plots', nargs='*', default=None, help="Figures à tracer (défaut : catalogue DEFAULT_PLOTS)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = {
+        'meta': {
+            'date': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'datasets': {f'{n}y': bench_dataset(n, args.workers, args.plots) for n in args.years},
+    }
+    results['datasets']['startup'] = bench_startup()
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Résultats écrits : {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
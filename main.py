@@ -1,6 +1,7 @@
 from src.generator import SwissGridGenerator
 from src.analyzer import WinterGapAnalyzer
-from src.visualizer import SwissGridVisualizer
+from src.rendering import render
+from src.scenarios import ScenarioEngine
 
 def main():
     print("Démarrage de la simulation Swiss Winter Gap...")
@@ -13,9 +14,13 @@ def main():
     analyzer = WinterGapAnalyzer(df)
     df_analyzed = analyzer.analyze()
     
-    # 3. Visualisation graphique
-    visualizer = SwissGridVisualizer(df_analyzed)
-    visualizer.plot_winter_gap()
+    # 3. Monte Carlo : distribution des KPIs sur 1000 années stochastiques
+    kpis = ScenarioEngine(generator, seed=2025).run(1000)
+    print(ScenarioEngine.summary(kpis).round(1).to_string())
+
+    # 4. Visualisation graphique (catalogue src.rendering : données brutes puis tendance MA7)
+    render(df_analyzed, 'WinterGap_Brut')
+    render(df_analyzed, 'WinterGap_MA7')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
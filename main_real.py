@@ -1,62 +1,230 @@
-from src.loader import SwissGridLoader
-from src.analyzer import WinterGapAnalyzer
-from src.visualizer import SwissGridVisualizer
-from src.border_analyzer import BorderAnalyzer
-from src.transit_analyzer import TransitAnalyzer
-from src.cost_analyzer import CostAnalyzer
-from src.advanced_stats import AdvancedAnalyzer
+import argparse
 import os
+import sys
+from src import profiling
+
+# Les modules d'analyse (et donc matplotlib / seaborn) ne sont importés que par les
+# sous-commandes qui tracent : `kpi` et `export` démarrent sans bibliothèque graphique.
+COMMANDS = ('all', 'kpi', 'plot', 'export', 'events', 'live')
+
+
+def parse_args(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Sans sous-commande : comportement historique (KPIs + toutes les figures)
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv = ['all'] + argv
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--swissgrid', default=os.path.join('data', 'swissgrid_2025.xlsx'),
+                        help="Classeur Swissgrid, ou dossier / glob de classeurs annuels (multi-années)")
+    common.add_argument('--prices', default=os.path.join('data', 'SpotPrices_OpenData.xlsx'))
+    common.add_argument('--workers', type=int, default=None, help="Processus pour le rendu/la lecture")
+    common.add_argument('--profile', nargs='?', const='', metavar='REPORT_JSON',
+                        help="Mesure chaque étape (temps, CPU, mémoire, lignes) ; rapport JSON optionnel")
+    common.add_argument('--profile-memory', action='store_true', help="Avec --profile : pic mémoire (tracemalloc)")
+    common.add_argument('--cprofile', metavar='DIR', help="Avec --profile : un fichier cProfile par étape dans DIR")
+
+    parser = argparse.ArgumentParser(description="Swiss Winter Gap & Border Analysis")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_all = sub.add_parser('all', parents=[common], help="KPIs et toutes les figures (défaut)")
+    p_all.add_argument('--headless', metavar='OUTPUT_DIR',
+                       help="Mode batch : écrit toutes les figures dans OUTPUT_DIR au lieu de les afficher")
+    p_all.add_argument('--format', default='png', choices=['png', 'pdf', 'svg'])
+    p_all.add_argument('--live', metavar='SOURCE', help="Équivalent de la sous-commande `live`")
+
+    sub.add_parser('kpi', parents=[common], help="KPIs Winter Gap en console (sans bibliothèque graphique)")
+
+    p_plot = sub.add_parser('plot', parents=[common], help="Une ou plusieurs figures du catalogue")
+    p_plot.add_argument('names', nargs='*', metavar='NAME', help="Figures (défaut : toutes), cf. src/rendering.py")
+    p_plot.add_argument('--output', metavar='OUTPUT_DIR', help="Écrit les figures dans OUTPUT_DIR (headless)")
+    p_plot.add_argument('--format', default='png', choices=['png', 'pdf', 'svg'])
+
+    p_export = sub.add_parser('export', parents=[common], help="Exporte le DataFrame d'analyse et les KPIs")
+    p_export.add_argument('output', help="Fichier (.parquet / .csv) ou dossier (jeu partitionné par année/mois)")
+    p_export.add_argument('--format', default='parquet', choices=['parquet', 'csv'],
+                          help="Format du jeu partitionné (si OUTPUT est un dossier)")
+    p_export.add_argument('--compact', action='store_true', help="Schéma compact float32 (cf. src/schema.py)")
+
+    p_events = sub.add_parser('events', parents=[common], help="Épisodes de déficit, pointes d'import, rampes, chutes")
+    p_events.add_argument('--kind', nargs='*', help="Types (deficit, import_peak, ramp:up, ramp:down, production_drop)")
+    p_events.add_argument('--min-hours', type=float, help="Durée minimale d'un épisode")
+    p_events.add_argument('--start', help="Début de période (ex. 2015)")
+    p_events.add_argument('--end', help="Fin de période, exclue (ex. 2026)")
+    p_events.add_argument('--output', metavar='CSV', help="Écrit les épisodes sélectionnés en CSV")
+
+    p_live = sub.add_parser('live', parents=[common], help="Suit un flux 15 min (CSV Zeitreihen0h15 ou tcp://hôte:port)")
+    p_live.add_argument('source')
+    return parser.parse_args(argv)
+
+
+def load(args):
+    from src.loader import SwissGridLoader, MultiYearLoader
+
+    if os.path.isfile(args.swissgrid):
+        loader = SwissGridLoader(args.swissgrid, args.prices)
+    else:
+        loader = MultiYearLoader(args.swissgrid, args.prices, workers=args.workers)
+    return loader.load_data()
+
+
+def print_live_status(live):
+    last, rolling = live.last, live.rolling_means()
+    print(f"   -> {last['Timestamp']:%Y-%m-%d %H:%M} | Conso {last['Consumption_MW']:.0f} MW "
+          f"(7j : {rolling['Consumption_MW']:.0f}) | Prod {last['Production_MW']:.0f} MW "
+          f"| Déficit max {live.max_deficit_mw:.0f} MW | Bilan {live.revenue_cumul_eur / 1e6:.2f} M€")
+
+
+def run_live(args, source):
+    from src.live import LiveAggregator, open_feed, parse_records
+
+    print(f"Mode flux : {source} (Ctrl+C pour arrêter)")
+    prices = args.prices if os.path.exists(args.prices) else None
+    live = LiveAggregator(prices, on_step=print_live_status)
+    try:
+        live.consume(parse_records(open_feed(source, follow=True)))
+    except KeyboardInterrupt:
+        print("🛑 Arrêt du flux.")
+    print(live.snapshot())
+
+
+def run_kpi(args, df):
+    from src.analyzer import WinterGapAnalyzer
+
+    WinterGapAnalyzer(df).analyze()
+
+
+def check_plot_names(names):
+    # Vérifié avant le chargement des données (le catalogue n'importe aucun module graphique)
+    from src.rendering import PLOTS
+
+    unknown = [name for name in names if name not in PLOTS]
+    if unknown:
+        sys.exit(f"❌ Figure(s) inconnue(s) : {', '.join(unknown)} (disponibles : {', '.join(PLOTS)})")
+
+
+def run_plot(args, df):
+    from src.rendering import DEFAULT_PLOTS, render, render_all
+
+    if args.output:
+        render_all(df, args.output, fmt=args.format, names=args.names or None, workers=args.workers)
+    else:
+        for name in args.names or DEFAULT_PLOTS:
+            render(df, name)
+
+
+def run_export(args, df):
+    if not args.output.endswith(('.parquet', '.csv')):
+        # Dossier : série partitionnée par année/mois + tables de KPIs (cf. src/export.py)
+        from src.export import export_dataset
+
+        export_dataset(df, args.output, fmt=args.format, compact=args.compact)
+        return
+
+    print(f"Export : {args.output}")
+    if args.compact:
+        from src.schema import compact
+
+        df = compact(df)
+    if args.output.endswith('.parquet'):
+        df.to_parquet(args.output)
+    else:
+        df.to_csv(args.output)
+    print(f"✅ {len(df)} lignes exportées.")
+
+
+def run_events(args, df):
+    from src.events import EventDetector
+
+    index = EventDetector(df).detect()
+    print(f"\n--- ÉVÉNEMENTS ({len(index)} détectés) ---")
+    print(index.summary().round(1).to_string())
+    events = index.query(kind=args.kind, start=args.start, end=args.end, min_hours=args.min_hours)
+    print(f"\n{len(events)} épisode(s) sélectionné(s) :")
+    print(events.sort_values('Duration_Hours', ascending=False).head(20).to_string(index=False, float_format='%.1f'))
+    if args.output:
+        events.to_csv(args.output, index=False)
+        print(f"✅ Épisodes écrits : {args.output}")
+
+
+def run_all(args, df):
+    from src.analyzer import WinterGapAnalyzer
+
+    if args.headless:
+        from src.rendering import render_all
+
+        WinterGapAnalyzer(df).analyze()
+        render_all(df, args.headless, fmt=args.format, workers=args.workers)
+        return
+
+    from src.visualizer import SwissGridVisualizer
+    from src.border_analyzer import BorderAnalyzer
+    from src.transit_analyzer import TransitAnalyzer
+    from src.cost_analyzer import CostAnalyzer
+    from src.advanced_stats import AdvancedAnalyzer
+
+    # 1. Analyse Winter Gap
+    analyzer = WinterGapAnalyzer(df)
+    df_analyzed = analyzer.analyze()
+    visualizer = SwissGridVisualizer(df_analyzed)
+    # --- A. Vue Brute (Technique) : Affiche le bruit, les pics horaires, la réalité physique 15min/1h ---
+    visualizer.plot_raw_data()
+    # --- B. Vue Lissée (Stratégique) : Affiche la tendance globale ---
+    visualizer.plot_smoothed_trend()
+
+    # 2. Analyse des Frontières
+    border = BorderAnalyzer(df)
+    border.plot_cross_border_flows()
+
+    # 3. Analyse du Transit
+    transit = TransitAnalyzer(df)
+    # --- A. Vue Brute (Technique) : Affiche le bruit, les pics horaires, la réalité physique 15min/1h ---
+    transit.plot_total_activity_raw()
+    # --- B. Vue Lissée (Stratégique) : Affiche la tendance globale ---
+    transit.plot_total_activity_smoothed()
+    # --- C. Transit pur (Le Vrai Hub) ---
+    transit.plot_pure_transit()
+
+    # 4. Analyse Financière
+    cost = CostAnalyzer(df)
+    cost.plot_financial_balance()
+    cost.plot_border_valuation()
+
+    # 5. ANALYSES AVANCÉES (NOUVEAU)
+    print("\n--- Démarrage des Analyses Statistiques Avancées ---")
+    adv = AdvancedAnalyzer(df)
+    # --- A. La Monotone (Indispensable pour le Winter Gap) ---
+    adv.plot_duration_curve()
+    # --- B. Le Heatmap (Visuellement top pour le rapport) ---
+    adv.plot_seasonal_heatmap()
+    # --- C. Corrélation Prix (Pour la partie éco) ---
+    adv.plot_price_correlation()
+
+
+RUNNERS = {'all': run_all, 'kpi': run_kpi, 'plot': run_plot, 'export': run_export, 'events': run_events}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile is not None:
+        profiling.configure(memory=args.profile_memory, cprofile_dir=args.cprofile)
+
+    if args.command == 'live' or getattr(args, 'live', None):
+        return run_live(args, getattr(args, 'source', None) or args.live)
+
+    if args.command == 'plot':
+        check_plot_names(args.names)
 
-def main():
     print("Démarrage Swiss Winter Gap & Border Analysis...")
-    
-    file_swissgrid = 'swissgrid_2025.xlsx'
-    file_prices = 'SpotPrices_OpenData.xlsx'
-    filepath_swissgrid = os.path.join('data', file_swissgrid)
-    filepath_prices = os.path.join('data', file_prices)
-    
-    loader = SwissGridLoader(filepath_swissgrid, filepath_prices)
-    df = loader.load_data()
-    
+    df = load(args)
     if df is not None:
-        # 1. Analyse Winter Gap
-        analyzer = WinterGapAnalyzer(df)
-        df_analyzed = analyzer.analyze()
-        visualizer = SwissGridVisualizer(df_analyzed)
-        # --- A. Vue Brute (Technique) : Affiche le bruit, les pics horaires, la réalité physique 15min/1h ---
-        visualizer.plot_raw_data()
-        # --- B. Vue Lissée (Stratégique) : Affiche la tendance globale ---
-        visualizer.plot_smoothed_trend()
-        
-        # 2. Analyse des Frontières
-        border = BorderAnalyzer(df)
-        border.plot_cross_border_flows()
-
-        # 3. Analyse du Transit
-        transit = TransitAnalyzer(df)
-        # --- A. Vue Brute (Technique) : Affiche le bruit, les pics horaires, la réalité physique 15min/1h ---
-        transit.plot_total_activity_raw()
-        # --- B. Vue Lissée (Stratégique) : Affiche la tendance globale ---
-        transit.plot_total_activity_smoothed()
-        # --- C. Transit pur (Le Vrai Hub) ---
-        transit.plot_pure_transit()
-
-        # 4. Analyse Financière
-        cost = CostAnalyzer(df)
-        cost.plot_financial_balance()
-
-        # 5. ANALYSES AVANCÉES (NOUVEAU)
-        print("\n--- Démarrage des Analyses Statistiques Avancées ---")
-        adv = AdvancedAnalyzer(df)
-        # --- A. La Monotone (Indispensable pour le Winter Gap) ---
-        adv.plot_duration_curve()
-        # --- B. Le Heatmap (Visuellement top pour le rapport) ---
-        adv.plot_seasonal_heatmap()
-        # --- C. Corrélation Prix (Pour la partie éco) ---
-        adv.plot_price_correlation()
-        
+        RUNNERS[args.command](args, df)
     else:
         print("Problème de chargement.")
 
+    if args.profile is not None:
+        profiling.report(args.profile or None)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,12 +2,33 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
+from src.resolution import resolution_step, step_hours
+from src.schema import with_derived
+from src.rendering import finish
+from src.profiling import profiled
+from src.duration_curve import DurationCurve
+from src.derived_cache import get_store
 
 class AdvancedAnalyzer:
-    def __init__(self, df):
-        self.df = df
+    def __init__(self, df, resolution=None):
+        self.df = with_derived(df, ['Residual_Load_MW'])
+        self.hours = step_hours(resolution_step(df, resolution))
+        self._duration_curve = None
         sns.set_theme(style="whitegrid")
 
+    @property
+    def duration_curve(self):
+        """Monotone de 'Residual_Load_MW' (triée une seule fois, requêtes en O(log n))."""
+        if self._duration_curve is None:
+            self._duration_curve = DurationCurve(self.df['Residual_Load_MW'].to_numpy(), self.hours)
+        return self._duration_curve
+
+    @property
+    def calendar_cube(self):
+        """Cube année x mois x jour x heure de toutes les colonnes (construit une fois par jeu de données)."""
+        return get_store(self.df).calendar_cube()
+
+    @profiled()
     def plot_duration_curve(self):
         """
         ÉTUDE 1 : Monotone de Charge Résiduelle (RLDC)
@@ -20,30 +41,32 @@ class AdvancedAnalyzer:
             return
         
         # Tri décroissant (Du plus gros Déficit au plus gros Surplus)
-        gap_sorted = self.df['Residual_Load_MW'].sort_values(ascending=False).reset_index(drop=True)
+        # Axe X en heures cumulées (un pas = 1h en horaire, 0.25h au quart d'heure)
+        hours_axis, gap_sorted = self.duration_curve.curve()
         
         plt.figure(figsize=(12, 6))
         
         # Zone Déficit (Besoin d'import) : Valeurs > 0
-        plt.fill_between(gap_sorted.index, gap_sorted, 0, 
+        plt.fill_between(hours_axis, gap_sorted, 0, 
                          where=(gap_sorted > 0), color='#e74c3c', alpha=0.3, label='Déficit (Import Requis)')
         
         # Zone Surplus (Capacité Export) : Valeurs < 0
-        plt.fill_between(gap_sorted.index, gap_sorted, 0, 
+        plt.fill_between(hours_axis, gap_sorted, 0, 
                          where=(gap_sorted < 0), color='#2ecc71', alpha=0.3, label='Surplus (Export Possible)')
         
-        plt.plot(gap_sorted.index, gap_sorted, color='black', lw=1.5)
+        plt.plot(hours_axis, gap_sorted, color='black', lw=1.5)
         
         # Ligne zéro
         plt.axhline(0, color='black', linestyle='--')
         
         plt.title("Monotone de Charge Résiduelle (Residual Load Duration Curve)", fontsize=14, fontweight='bold')
-        plt.xlabel("Heures cumulées (0 à 8760)")
+        plt.xlabel(f"Heures cumulées (0 à {self.duration_curve.total_hours:.0f})")
         plt.ylabel("Déficit (+) / Surplus (-) [MW]")
         plt.legend()
         plt.tight_layout()
-        plt.show()
+        finish('ResidualLoad_DurationCurve')
 
+    @profiled()
     def plot_seasonal_heatmap(self):
         """
         ÉTUDE 2 : Heatmap Saisonnier (Mois vs Heure)
@@ -53,13 +76,8 @@ class AdvancedAnalyzer:
         
         if 'Residual_Load_MW' not in self.df.columns: return
         
-        # Préparation des données pivot
-        df_hm = self.df[['Residual_Load_MW']].copy()
-        df_hm['Month'] = df_hm.index.month
-        df_hm['Hour'] = df_hm.index.hour
-        
-        # Pivot : Lignes=Heures, Colonnes=Mois, Valeur=Gap Moyen
-        pivot_table = df_hm.pivot_table(values='Residual_Load_MW', index='Hour', columns='Month', aggfunc='mean')
+        # Lignes=Heures, Colonnes=Mois, Valeur=Gap Moyen (lu dans le cube calendaire, sans pivot)
+        pivot_table = self.calendar_cube.table('Residual_Load_MW', 'hour', 'month').dropna(axis=1, how='all')
         
         plt.figure(figsize=(10, 8))
         
@@ -74,8 +92,9 @@ class AdvancedAnalyzer:
         plt.gca().invert_yaxis() # 0h en bas
         
         plt.tight_layout()
-        plt.show()
+        finish('TimeSignature')
 
+    @profiled()
     def plot_price_correlation(self):
         """
         ÉTUDE 3 : Scatter Plot (Position Nette vs Prix Proxy)
@@ -109,4 +128,4 @@ class AdvancedAnalyzer:
         plt.text(net_position.max()*0.9, prices.min()*1.1, "EXPORT\n(Prix Bas)", color='green', fontweight='bold', ha='right')
 
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        finish('ScatterPlot')
\ No newline at end of file
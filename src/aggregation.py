@@ -0,0 +1,139 @@
+import pandas as pd
+import numpy as np
+from src.resolution import freq_to_timedelta
+
+QUARTER_NS = 15 * 60 * 10**9
+
+
+def to_utc(index, tz='Europe/Zurich'):
+    """
+    Horodatages Swissgrid (heure locale naïve, dans l'ordre de la feuille) -> instants UTC (ns).
+
+    L'heure d'été / d'hiver se déduit de la position de chaque ligne, pas de l'horodatage seul :
+    - une ligne qui ne dépasse pas le maximum des lignes précédentes appartient au 2e passage
+      de l'heure répétée d'automne (heure d'hiver) ;
+    - au retour en arrière d'automne, les lignes du 1er passage (heure d'été) sont recalées
+      avec le décalage d'été, y compris la fin d'intervalle "03:00" qui n'est pas ambiguë
+      pour le fuseau mais désigne 03:00 CEST (= 02:00 CET) ;
+    - l'heure inexistante de printemps ("02:00" en fin d'intervalle) est avancée d'une heure.
+    Deux lignes distinctes donnent toujours deux instants distincts (sauf doublon réel).
+    """
+    index = pd.DatetimeIndex(index).as_unit('ns')
+    naive = index.asi8
+    prev_max = np.maximum.accumulate(np.r_[np.iinfo('int64').min, naive[:-1]])
+    fold = naive <= prev_max
+    t = index.tz_localize(tz, ambiguous=~fold, nonexistent='shift_forward').tz_convert('UTC').asi8.copy()
+
+    # Retours en arrière tombant sur une heure ambiguë : changements d'heure d'automne
+    # (une itération par changement d'heure, pas par ligne)
+    jumps = np.flatnonzero(fold[1:] & ~fold[:-1]) + 1
+    if len(jumps):
+        ambiguous = np.asarray(index[jumps].tz_localize(tz, ambiguous='NaT', nonexistent='NaT').isna())
+        jumps = jumps[ambiguous & ~np.asarray(index[jumps].isna())]
+    if len(jumps):
+        summer = index[jumps].tz_localize(tz, ambiguous=np.ones(len(jumps), dtype=bool)).tz_convert('UTC').asi8
+        for j, t_summer in zip(jumps, summer):
+            std_offset = naive[j] - t[j]
+            shift = t[j] - t_summer
+            # 1er passage : lignes contiguës précédant le retour en arrière, au-delà de sa cible
+            first = np.searchsorted(naive[:j], naive[j], side='left')
+            t[first:j] = naive[first:j] - std_offset - shift
+    return t
+
+
+class LocalClock:
+    """
+    Équivalent en flux de to_utc, un horodatage à la fois (O(1), sans retour en arrière) :
+    - horodatage ne dépassant pas le maximum déjà vu -> 2e passage d'automne (heure d'hiver) ;
+    - quart d'heure suivant le précédent -> instant précédent + 15 min (le "03:00" qui clôt
+      le 1er passage reste en heure d'été, comme le recalage de to_utc) ;
+    - sinon localisation en heure d'été si ambiguë, heure inexistante avancée.
+    Résultat identique à to_utc tant que le flux n'a pas de trou juste avant le retour en arrière.
+    """
+
+    def __init__(self, tz='Europe/Zurich'):
+        self.tz = tz
+        self.max_naive = None
+        self.prev_naive = None
+        self.prev_utc = None
+
+    def to_utc(self, timestamp):
+        """Horodatage local naïf -> instant UTC (ns)."""
+        ts = pd.Timestamp(timestamp).as_unit('ns')
+        naive = ts.value
+        if self.max_naive is not None and naive <= self.max_naive:
+            utc = ts.tz_localize(self.tz, ambiguous=False, nonexistent='shift_forward').value
+        elif self.prev_naive is not None and naive - self.prev_naive == QUARTER_NS:
+            utc = self.prev_utc + QUARTER_NS
+        else:
+            utc = ts.tz_localize(self.tz, ambiguous=True, nonexistent='shift_forward').value
+        self.max_naive = naive if self.max_naive is None else max(self.max_naive, naive)
+        self.prev_naive, self.prev_utc = naive, utc
+        return utc
+
+    def label(self, bucket):
+        """Pas UTC (ns) -> étiquette locale naïve (ns), comme l'index de aggregate_power."""
+        return pd.Timestamp(bucket, tz='UTC').tz_convert(self.tz).tz_localize(None).value
+
+    def last_bucket(self, label):
+        """Dernier pas UTC (ns) portant l'étiquette locale `label` (2e passage si ambiguë)."""
+        return pd.Timestamp(label).tz_localize(self.tz, ambiguous=False, nonexistent='shift_forward') \
+            .tz_convert('UTC').value
+
+
+def aggregate_power(index, values, freq='h', tz='Europe/Zurich'):
+    """
+    Agrégation 15 min (kWh) -> puissance moyenne (MW) au pas `freq` ('h' ou '15min')
+    en une seule réduction NumPy.
+
+    Les horodatages Swissgrid sont en heure locale naïve (fin d'intervalle), convertis en
+    UTC par to_utc :
+    - heure longue d'automne : les deux passages sont conservés, l'heure locale
+      correspondante compte 8 échantillons (2 par quart d'heure local au pas '15min') ;
+    - heure courte de printemps : l'heure locale inexistante n'apparaît pas dans l'index.
+    Seules les lignes strictement identiques (même instant, mêmes valeurs) sont dédoublonnées ;
+    deux lignes distinctes au même instant sont toutes deux comptées (pas signalé).
+    La puissance est la moyenne des échantillons présents (somme * 4 / n / 1000) : l'énergie
+    d'un pas vaut donc MW x n x 0.25 h (cf. resolution.step_durations), y compris pour
+    l'heure longue d'automne et les pas partiels en bord de classeur.
+
+    Renvoie (index local naïf, matrice MW (pas, canaux), échantillons par pas,
+    échantillons attendus par pas).
+    """
+    bucket_ns = freq_to_timedelta(freq).value
+    per_bucket = bucket_ns // QUARTER_NS
+    values = np.asarray(values, dtype='float64')
+    index = pd.DatetimeIndex(index)
+    valid = np.asarray(index.notna())
+    index, values = index[valid], values[valid]
+
+    t = to_utc(index, tz)
+    if pd.Index(t).has_duplicates:
+        # Doublons réels (ex. recouvrement de deux téléchargements) : ligne entière identique
+        keep = ~pd.DataFrame(values).assign(_t=t).duplicated(keep='first').to_numpy()
+        t, values = t[keep], values[keep]
+
+    start = t.min() - (t.min() % bucket_ns)
+    buckets = (t - start) // bucket_ns
+    n_buckets = int(buckets.max()) + 1
+
+    # Sommes par (pas, canal) en un seul bincount sur des codes combinés pas x canal
+    n_channels = values.shape[1]
+    codes = (buckets[:, None] * n_channels + np.arange(n_channels)).ravel()
+    sums = np.bincount(codes, weights=np.nan_to_num(values).ravel(),
+                       minlength=n_buckets * n_channels).reshape(n_buckets, n_channels)
+    counts = np.bincount(buckets, minlength=n_buckets)
+
+    # Retour en heure locale naïve : les pas UTC de la nuit d'automne fusionnent
+    buckets_utc = pd.DatetimeIndex(start + np.arange(n_buckets) * bucket_ns, tz='UTC')
+    labels = buckets_utc.tz_convert(tz).tz_localize(None)
+    uniq, inverse = np.unique(labels.asi8, return_inverse=True)
+    merged = np.zeros((len(uniq), n_channels))
+    np.add.at(merged, inverse, sums)
+    counts = np.bincount(inverse, weights=counts).astype('int64')
+    expected = np.bincount(inverse).astype('int64') * per_bucket
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mw = merged * 4 / counts[:, None] / 1000
+    mw[counts == 0] = np.nan
+    return pd.DatetimeIndex(uniq.view(f'datetime64[{labels.unit}]')), mw, counts, expected
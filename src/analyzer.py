@@ -1,24 +1,28 @@
 import pandas as pd
+from src.resolution import step_durations
+from src.kpi import winter_gap_kpis
+from src.profiling import profiled
 
 class WinterGapAnalyzer:
-    def __init__(self, df):
+    def __init__(self, df, resolution=None):
         self.df = df
+        # Durée de chaque pas en heures : 1 en horaire, 0.25 au quart d'heure, 2 pour l'heure longue d'automne
+        self.hours = step_durations(df, resolution)
+        self.kpis = None
 
+    @profiled()
+    def compute_kpis(self):
+        """KPIs du Winter Gap (objet WinterGapKPIs), calculés sur les tableaux NumPy."""
+        self.kpis = winter_gap_kpis(self.df['Production_MW'].to_numpy(), self.df['Consumption_MW'].to_numpy(),
+                                    index=self.df.index, hours=self.hours)
+        return self.kpis
+
+    @profiled()
     def analyze(self):
         """Calcule la Position Nette (Export vs Import)"""
         
-        # Net Position : Positif = Export, Négatif = Import
-        self.df['Net_Position_MW'] = self.df['Production_MW'] - self.df['Consumption_MW']
-        
         # Calcul des KPIs pour affichage console
-        max_deficit = self.df['Net_Position_MW'].min()
-        hours_import = len(self.df[self.df['Net_Position_MW'] < 0])
-        total_import_need = self.df[self.df['Net_Position_MW'] < 0]['Net_Position_MW'].sum()
-        
-        print(f"\n--- RÉSULTATS DE L'ANALYSE (Suisse {self.df.index.year.unique()[0]}) ---")
-        print(f"Déficit Hivernal Max (Pointe) : {max_deficit:.2f} MW")
-        print(f"Heures d'import nécessaire    : {hours_import} h / 8760 h")
-        print(f"Volume total à importer       : {abs(total_import_need)/1000:.2f} GWh")
-        print(f"---------------------------------------------------\n")
+        self.compute_kpis().report(self.df.index.year.unique()[0])
         
-        return self.df
\ No newline at end of file
+        # Net Position : Positif = Export, Négatif = Import (nouveau DataFrame, l'entrée n'est pas modifiée)
+        return self.df.assign(Net_Position_MW=self.df['Production_MW'] - self.df['Consumption_MW'])
@@ -1,11 +1,17 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+from src.resolution import resolution_step
+from src.derived_cache import get_store
+from src.rendering import finish
+from src.profiling import profiled
 
 class BorderAnalyzer:
-    def __init__(self, df):
+    def __init__(self, df, resolution=None):
         self.df = df
+        self.step = resolution_step(df, resolution)
 
+    @profiled()
     def plot_cross_border_flows(self):
         print("Analyse des flux transfrontaliers (Basé sur Loader)...")
         
@@ -25,11 +31,9 @@ class BorderAnalyzer:
             print("❌ ERREUR : Pas de colonnes 'Net_Flow_XX_MW' trouvées. Vérifiez le Loader.")
             return
 
-        # 2. Création du DF pour le graphique (On renrenomme les colonnes pour l'affichage)
-        df_net_mw = self.df[available_cols].rename(columns=neighbors_map)
-
-        # 3. Lissage 7 jours (Pour la lisibilité)
-        df_smooth = df_net_mw.rolling(window=168, center=True).mean()
+        # 2. Lissage 7 jours (Pour la lisibilité), colonnes renommées pour l'affichage
+        # (moyennes mobiles mémoïsées, partagées avec les autres analyseurs)
+        df_smooth = get_store(self.df).rolling_frame(available_cols, step=self.step).rename(columns=neighbors_map)
         
         # --- Visualisation ---
         sns.set_theme(style="whitegrid")
@@ -64,4 +68,4 @@ class BorderAnalyzer:
         ax.legend(loc='upper left', frameon=True)
         
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        finish('FluxTransfrontaliers')
\ No newline at end of file
@@ -0,0 +1,70 @@
+import pandas as pd
+import os
+import glob
+import json
+import hashlib
+
+class ParquetCache:
+    """
+    Cache disque des fichiers Swissgrid déjà parsés (format Parquet colonnaire).
+    Clé = empreinte SHA-256 du classeur + version du parser.
+    Le cache est stocké à côté de la source, dans un dossier '.cache'.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _paths(self, filepath, version):
+        stem = os.path.basename(filepath)
+        sha = self._file_hash(filepath)
+        base = os.path.join(self.cache_dir, f"{stem}.{sha[:16]}.v{version}")
+        return base + ".parquet", stem, sha[:16]
+
+    def _file_hash(self, filepath):
+        # Index (mtime, taille) -> hash : on ne re-hashe le classeur que s'il a été modifié
+        stat = os.stat(filepath)
+        index_path = os.path.join(self.cache_dir, f"{os.path.basename(filepath)}.json")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            if index.get('mtime') == stat.st_mtime and index.get('size') == stat.st_size:
+                return index['sha256']
+
+        h = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        sha = h.hexdigest()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(index_path, 'w') as f:
+            json.dump({'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha}, f)
+        return sha
+
+    def load(self, filepath, version):
+        """Renvoie le DataFrame en cache, ou None si absent / invalidé."""
+        path, _, _ = self._paths(filepath, version)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"⚠️ Cache illisible, relecture du classeur : {e}")
+            return None
+
+    def store(self, filepath, version, df):
+        path, stem, sha = self._paths(filepath, version)
+        try:
+            df.to_parquet(path)
+        except ImportError as e:
+            print(f"⚠️ Cache désactivé (pyarrow manquant) : {e}")
+            return
+        # On supprime les entrées périmées (ancien contenu ou ancienne version du parser) ;
+        # la version peut porter une variante ("3-streaming", "3-pandas") : les autres variantes
+        # du même contenu et de la même version du parser sont conservées
+        parser = str(version).split('-', 1)[0]
+        for old in glob.glob(os.path.join(self.cache_dir, glob.escape(stem) + ".*.parquet")):
+            old_sha, _, old_version = os.path.basename(old)[len(stem) + 1:-len(".parquet")].partition('.v')
+            if old != path and (old_sha != sha or old_version.split('-', 1)[0] != parser):
+                os.remove(old)
+        print(f"   -> Cache écrit : {path}")
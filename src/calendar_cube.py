@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from src.schema import COLUMNS, with_derived
+
+# Axes du cube (ordre des dimensions) et valeurs possibles hors année
+AXES = ('year', 'month', 'weekday', 'hour')
+SHAPE = {'month': 12, 'weekday': 7, 'hour': 24}  # weekday : 0 = lundi
+
+
+class CalendarCube:
+    """
+    Cube d'agrégats calendaires (année x mois x jour de semaine x heure) de chaque colonne :
+    somme, nombre, min, max et somme des carrés par cellule. Construit en une passe
+    (un tri des pas par cellule puis des réductions par blocs contigus) ; toute requête
+    sur une tranche (ex. Q1, jours ouvrés, par heure) ne touche que ces 2016 cellules
+    par année et par colonne, sans revenir aux données. Deux cubes (années différentes ou non)
+    se fusionnent en additionnant les agrégats.
+    """
+
+    def __init__(self, columns, years, sums, counts, sumsq, mins, maxs):
+        self.columns = list(columns)
+        self.years = np.asarray(years)
+        # Tableaux (colonnes, années, 12, 7, 24)
+        self.sums, self.counts, self.sumsq, self.mins, self.maxs = sums, counts, sumsq, mins, maxs
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Cube de toutes les colonnes canoniques numériques présentes (dérivées comprises)."""
+        df = with_derived(df)
+        if columns is None:
+            columns = [c for c in COLUMNS if c in df.columns and c != 'Samples_15min']
+        index = pd.DatetimeIndex(df.index)
+        years, year_codes = np.unique(index.year, return_inverse=True)
+        cells = ((year_codes * 12 + index.month.to_numpy() - 1) * 7 + index.dayofweek.to_numpy()) * 24 \
+            + index.hour.to_numpy()
+        n_cells = len(years) * 12 * 7 * 24
+
+        # Tri stable par cellule : chaque cellule devient un bloc contigu (reduceat)
+        order = np.argsort(cells, kind='stable')
+        cells = cells[order]
+        values = df[columns].to_numpy(dtype='float64')[order]
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        present = cells[starts]
+
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        shape = (n_cells, len(columns))
+        sums, sumsq = np.zeros(shape), np.zeros(shape)
+        counts = np.zeros(shape, dtype='int64')
+        mins, maxs = np.full(shape, np.inf), np.full(shape, -np.inf)
+        sums[present] = np.add.reduceat(filled, starts, axis=0)
+        sumsq[present] = np.add.reduceat(filled * filled, starts, axis=0)
+        counts[present] = np.add.reduceat(valid.astype('int64'), starts, axis=0)
+        mins[present] = np.minimum.reduceat(np.where(valid, values, np.inf), starts, axis=0)
+        maxs[present] = np.maximum.reduceat(np.where(valid, values, -np.inf), starts, axis=0)
+
+        cube_shape = (len(years), 12, 7, 24, len(columns))
+        to_cube = lambda a: np.moveaxis(a.reshape(cube_shape), -1, 0)
+        return cls(columns, years, to_cube(sums), to_cube(counts), to_cube(sumsq), to_cube(mins), to_cube(maxs))
+
+    def merge(self, other):
+        """Cube de l'union des deux périodes (mêmes colonnes ; années communes additionnées)."""
+        if self.columns != other.columns:
+            raise ValueError(f"Colonnes différentes : {self.columns} / {other.columns}")
+        years = np.union1d(self.years, other.years)
+        shape = (len(self.columns), len(years), 12, 7, 24)
+        arrays = {
+            'sums': np.zeros(shape), 'counts': np.zeros(shape, dtype='int64'), 'sumsq': np.zeros(shape),
+            'mins': np.full(shape, np.inf), 'maxs': np.full(shape, -np.inf),
+        }
+        combine = {'sums': np.add, 'counts': np.add, 'sumsq': np.add, 'mins': np.minimum, 'maxs': np.maximum}
+        for cube in (self, other):
+            pos = np.searchsorted(years, cube.years)
+            for name, out in arrays.items():
+                out[:, pos] = combine[name](out[:, pos], getattr(cube, name))
+        return CalendarCube(self.columns, years, **arrays)
+
+    def _positions(self, axis, wanted):
+        """Positions sur l'axe des valeurs demandées (toutes si None)."""
+        if axis == 'year':
+            return np.arange(len(self.years)) if wanted is None else np.flatnonzero(np.isin(self.years, wanted))
+        positions = np.arange(SHAPE[axis])
+        if wanted is None:
+            return positions
+        wanted = np.atleast_1d(wanted)
+        return wanted - 1 if axis == 'month' else wanted
+
+    def _slice(self, column, filters):
+        """Sous-cube (petite copie) d'une colonne, filtré par années/mois/jours/heures."""
+        i = self.columns.index(column)
+        grid = np.ix_(*[self._positions(axis, filters.get(axis)) for axis in AXES])
+        return tuple(a[i][grid] for a in (self.sums, self.counts, self.sumsq, self.mins, self.maxs))
+
+    def query(self, column, by=(), **filters):
+        """
+        Statistiques d'une tranche, ventilées selon les axes `by` (ex. ('weekday', 'hour')).
+        Filtres : year, month (1-12), weekday (0 = lundi), hour, en scalaire ou liste.
+        Renvoie un dict de tableaux NumPy : mean, std, min, max, count (forme = axes `by`).
+        Variance de population, calculée depuis les sommes (sans repasser sur les données).
+        """
+        unknown = set(filters) - set(AXES) | set(by) - set(AXES)
+        if unknown:
+            raise ValueError(f"Axes inconnus : {sorted(unknown)} (attendus : {AXES})")
+        sums, counts, sumsq, mins, maxs = self._slice(column, filters)
+        reduce_axes = tuple(k for k, axis in enumerate(AXES) if axis not in by)
+        n = counts.sum(axis=reduce_axes)
+        total = sums.sum(axis=reduce_axes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, total / n, np.nan)
+            var = np.where(n > 0, sumsq.sum(axis=reduce_axes) / n - mean * mean, np.nan)
+        lo, hi = mins.min(axis=reduce_axes, initial=np.inf), maxs.max(axis=reduce_axes, initial=-np.inf)
+        # L'ordre des axes `by` suit celui du cube : on le remet dans l'ordre demandé
+        kept = [axis for axis in AXES if axis in by]
+        perm = [kept.index(axis) for axis in by]
+        stats = {
+            'mean': mean, 'std': np.sqrt(np.maximum(var, 0)), 'count': n,
+            'min': np.where(n > 0, lo, np.nan), 'max': np.where(n > 0, hi, np.nan),
+        }
+        return {k: np.transpose(v, perm) if len(by) > 1 else v for k, v in stats.items()}
+
+    def mean(self, column, by=(), **filters):
+        return self.query(column, by, **filters)['mean']
+
+    def labels(self, axis, wanted=None):
+        """Valeurs de l'axe (années, mois 1-12, jours 0-6, heures 0-23), restreintes à `wanted`."""
+        positions = self._positions(axis, wanted)
+        return self.years[positions] if axis == 'year' else positions + 1 if axis == 'month' else positions
+
+    def table(self, column, rows, cols, stat='mean', **filters):
+        """Tableau 2-D (lignes `rows`, colonnes `cols`) d'une statistique, ex. heure x mois."""
+        values = self.query(column, (rows, cols), **filters)[stat]
+        frame = pd.DataFrame(values, index=self.labels(rows, filters.get(rows)),
+                             columns=self.labels(cols, filters.get(cols)))
+        frame.index.name, frame.columns.name = rows.capitalize(), cols.capitalize()
+        return frame
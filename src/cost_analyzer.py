@@ -2,11 +2,17 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
+from src.schema import with_derived
+from src.derived_cache import get_store
+from src.valuation import BorderValuation
+from src.rendering import finish
+from src.profiling import profiled
 
 class CostAnalyzer:
     def __init__(self, df):
-        self.df = df
+        self.df = with_derived(df, ['Revenue_Cumul_Million_EUR'])
 
+    @profiled()
     def plot_financial_balance(self):
         print("\n--- Génération Graphe : Bilan Financier (Prix Spot 2025) ---")
         
@@ -37,7 +43,7 @@ class CostAnalyzer:
 
         # --- Graphe 1 : Le Prix Spot (Journalier pour lisibilité) ---
         # On resample par jour pour éviter le bruit horaire illisible sur un an
-        daily_price = self.df['Price_EUR'].resample('D').mean()
+        daily_price = get_store(self.df).resample_mean('Price_EUR', 'D')
         
         ax1.plot(daily_price.index, daily_price, color='#2c3e50', lw=1.5, label="Prix Spot Moyen (Jour)")
         ax1.fill_between(daily_price.index, daily_price, color='#2c3e50', alpha=0.1)
@@ -75,4 +81,47 @@ class CostAnalyzer:
                          ha='center', fontsize=10)
 
         plt.tight_layout()        
-        plt.show()
\ No newline at end of file
+        finish('AnalyseFinancière')
+
+    @profiled()
+    def plot_border_valuation(self):
+        print("\n--- Génération Graphe : Valorisation par Frontière ---")
+        valuation = BorderValuation(self.df)
+        if not valuation.borders:
+            print("❌ ERREUR : Pas de colonnes 'Net_Flow_XX_MW' trouvées. Vérifiez le Loader.")
+            return
+        valuation.report()
+
+        monthly = valuation.by_month().pivot(index='Month', columns='Border', values='Revenue_CH_Million_EUR')
+        monthly.index = monthly.index.astype(str)  # barres aux positions 0..n (pas aux ordinaux des Period)
+        hourly = valuation.by_hour()
+        n_days = max(valuation.hours.sum() / 24, 1)
+
+        sns.set_theme(style="whitegrid")
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+
+        # --- Graphe 1 : Bilan mensuel par frontière (barres empilées, prix suisse) ---
+        monthly[valuation.borders].plot(kind='bar', stacked=True, ax=ax1, width=0.85,
+                                        color=sns.color_palette('Set2', len(valuation.borders)))
+        ax1.plot(range(len(monthly)), monthly.sum(axis=1), color='black', marker='o', lw=1.5, label='Total', zorder=3)
+        ax1.axhline(0, color='black', lw=1, linestyle='--')
+        ax1.set_title("Bilan Financier Mensuel par Frontière (Flux x Prix Spot Suisse)", fontsize=14, fontweight='bold')
+        ax1.set_ylabel("Millions €")
+        ax1.set_xlabel("")
+        ax1.set_xticklabels(monthly.index, rotation=90, fontsize=8)
+        ax1.legend(loc="best", ncol=5)
+
+        # --- Graphe 2 : Profil journalier moyen de la rente de congestion ---
+        for code in valuation.borders:
+            rent = hourly[hourly['Border'] == code]
+            ax2.plot(rent['Hour'], rent['Congestion_Rent_Million_EUR'] * 1000 / n_days, marker='.', lw=2, label=code)
+        ax2.axhline(0, color='black', lw=1, linestyle='--')
+        ax2.set_title("Rente de Congestion Moyenne par Heure (Flux x Écart de Prix Voisin - Suisse)",
+                      fontsize=14, fontweight='bold')
+        ax2.set_xlabel("Heure de la journée")
+        ax2.set_ylabel("k€ par jour")
+        ax2.set_xticks(range(24))
+        ax2.legend(loc="upper right")
+
+        plt.tight_layout()
+        finish('ValorisationFrontières')
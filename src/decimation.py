@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+
+def pixel_width(fig=None):
+    """Largeur de la figure courante en pixels (= nombre de colonnes utiles à dessiner)."""
+    import matplotlib.pyplot as plt
+    fig = fig or plt.gcf()
+    return int(fig.get_figwidth() * fig.dpi)
+
+
+def minmax_envelope(values, n_buckets):
+    """
+    Indices à conserver : min et max de chaque paquet (paquets de taille égale).
+    Les pics (ex. imports > 4 GW) sont conservés exactement. Vectorisé.
+    """
+    values = np.asarray(values, dtype='float64')
+    n = len(values)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)  # division entière arrondie au-dessus
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = values
+    blocks = padded.reshape(n_buckets, size)
+    nan = np.isnan(blocks)
+    offsets = np.arange(n_buckets) * size
+    i_min = offsets + np.where(nan, np.inf, blocks).argmin(axis=1)
+    i_max = offsets + np.where(nan, -np.inf, blocks).argmax(axis=1)
+
+    keep = np.unique(np.concatenate([i_min, i_max]))
+    return keep[keep < n]
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets : garde le point qui forme le plus grand triangle
+    avec le point retenu précédent et la moyenne du paquet suivant. Renvoie des indices.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:nxt_hi].mean(), np.nanmean(y[hi:nxt_hi])
+        # Aire (x2) du triangle (a, candidat, moyenne du paquet suivant)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        keep[i + 1] = a
+    return keep
+
+
+def decimate(series, n_out=None, method='minmax'):
+    """
+    Réduit une série temporelle brute à ~n_out points avant tracé
+    (par défaut : la largeur de la figure en pixels).
+    method : 'minmax' (enveloppe min/max par pixel) ou 'lttb'.
+    """
+    n_out = n_out or pixel_width()
+    if method == 'lttb':
+        x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else series.index
+        keep = lttb(x, series.to_numpy(), n_out)
+    else:
+        keep = minmax_envelope(series.to_numpy(), max(n_out // 2, 1))
+    return series.iloc[keep]
@@ -0,0 +1,112 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.resolution import SMOOTHING_WINDOW, resolution_step, rolling_mean
+from src.calendar_cube import CalendarCube
+
+# Un store par axe temporel : les DataFrames dérivés d'un même chargement
+# (analyze(), with_derived(), sélections de colonnes) partagent le même index
+# et donc les mêmes séries lissées, même s'il s'agit d'objets distincts.
+# LRU borné : seuls les MAX_STORES axes les plus récemment utilisés sont conservés.
+MAX_STORES = 8
+_STORES = OrderedDict()
+
+
+def _fingerprint(values):
+    # Empreinte sensible à l'ordre (une somme de hash ne distingue pas deux permutations)
+    digest = hashlib.blake2b(pd.util.hash_array(np.asarray(values)).tobytes(), digest_size=16)
+    return len(values), digest.hexdigest()
+
+
+def get_store(df):
+    """Store de séries dérivées associé à l'index de `df` (créé au premier appel)."""
+    key = _fingerprint(df.index.as_unit('ns').asi8 if isinstance(df.index, pd.DatetimeIndex) else df.index)
+    store = _STORES.get(key)
+    if store is None:
+        store = _STORES[key] = DerivedSeriesStore()
+        while len(_STORES) > MAX_STORES:
+            _STORES.popitem(last=False)
+    else:
+        _STORES.move_to_end(key)
+    store.bind(df)
+    return store
+
+
+def clear():
+    """Vide tous les stores (ex. après un rechargement des données)."""
+    _STORES.clear()
+
+
+class DerivedSeriesStore:
+    """
+    Mémoïsation des séries dérivées (moyennes mobiles, rééchantillonnages) partagées
+    entre analyseurs. Clé = (colonne, opération, paramètre). Chaque entrée garde
+    l'empreinte de la colonne source : si la colonne est modifiée ou remplacée,
+    l'entrée est recalculée.
+    """
+
+    def __init__(self):
+        self._df = None
+        self._entries = {}
+        self._cubes = {}  # id(df) -> (référence faible, signature, cube)
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, df):
+        # Référence faible : le store ne prolonge pas la vie du DataFrame
+        self._df = weakref.ref(df)
+
+    @property
+    def df(self):
+        return self._df()
+
+    def _get(self, column, operation, param, compute):
+        series = self.df[column]
+        key = (column, operation, param)
+        fingerprint = _fingerprint(series.to_numpy())
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        result = compute(series)
+        self._entries[key] = (fingerprint, result)
+        return result
+
+    def rolling_mean(self, column, window=SMOOTHING_WINDOW, step=None):
+        """Moyenne mobile centrée (fenêtre en durée) d'une colonne."""
+        step = step if step is not None else resolution_step(self.df)
+        return self._get(column, 'rolling_mean', window, lambda s: rolling_mean(s, step, window))
+
+    def rolling_frame(self, columns, window=SMOOTHING_WINDOW, step=None):
+        """Moyennes mobiles de plusieurs colonnes, assemblées en DataFrame."""
+        return pd.DataFrame({c: self.rolling_mean(c, window, step) for c in columns})
+
+    def resample_mean(self, column, freq='D'):
+        """Moyenne rééchantillonnée (ex. prix journalier)."""
+        return self._get(column, 'resample_mean', freq, lambda s: s.resample(freq).mean())
+
+    def calendar_cube(self):
+        """
+        Cube calendaire de toutes les colonnes canoniques, mis en cache par DataFrame
+        (référence faible, clé id(df)) : reconstruit pour un autre DataFrame ou si les colonnes
+        ou la longueur changent, sans hacher les valeurs à chaque accès. Après une
+        modification en place des valeurs, appeler clear().
+        """
+        df = self.df
+        signature = (tuple(df.columns), len(df))
+        entry = self._cubes.get(id(df))
+        if entry is not None and entry[0]() is df and entry[1] == signature:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        cube = CalendarCube.from_frame(df)
+        # DataFrames disparus : leurs cubes sont libérés au passage
+        self._cubes = {key: e for key, e in self._cubes.items() if e[0]() is not None}
+        self._cubes[id(df)] = (weakref.ref(df), signature, cube)
+        return cube
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries) + len(self._cubes)}
@@ -0,0 +1,147 @@
+import numpy as np
+from src.resolution import resolution_step, step_hours
+
+
+class DurationCurve:
+    """
+    Monotone exacte : les valeurs sont triées une seule fois, puis chaque requête
+    ("heures au-dessus de 3 GW", quantile P99...) est une recherche dichotomique O(log n).
+    Deux monotones (années, scénarios) se fusionnent sans retrier les données brutes.
+    `hours` : durée d'un pas (1.0 en horaire, 0.25 au quart d'heure).
+    """
+
+    def __init__(self, values, hours=1.0, presorted=False):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        self.sorted = values if presorted else np.sort(values)  # croissant
+        self.hours = hours
+
+    @classmethod
+    def from_frame(cls, df, column='Residual_Load_MW', resolution=None):
+        return cls(df[column].to_numpy(), step_hours(resolution_step(df, resolution)))
+
+    def __len__(self):
+        return len(self.sorted)
+
+    @property
+    def total_hours(self):
+        return len(self.sorted) * self.hours
+
+    def hours_above(self, threshold):
+        """Heures où la valeur dépasse strictement `threshold` (scalaire ou tableau)."""
+        return (len(self.sorted) - np.searchsorted(self.sorted, threshold, side='right')) * self.hours
+
+    def hours_below(self, threshold):
+        """Heures où la valeur est strictement inférieure à `threshold`."""
+        return np.searchsorted(self.sorted, threshold, side='left') * self.hours
+
+    def quantile(self, q):
+        """Quantile(s) exact(s), interpolation linéaire (comme np.quantile)."""
+        pos = np.asarray(q, dtype='float64') * (len(self.sorted) - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, len(self.sorted) - 1)
+        return self.sorted[lo] + (pos - lo) * (self.sorted[hi] - self.sorted[lo])
+
+    def value_at_hours(self, hours):
+        """Point de la monotone : valeur atteinte ou dépassée pendant `hours` heures."""
+        rank = np.clip(np.ceil(np.asarray(hours) / self.hours).astype(int), 1, len(self.sorted))
+        return self.sorted[len(self.sorted) - rank]
+
+    def curve(self):
+        """(heures cumulées, valeurs décroissantes) pour le tracé (vue, sans copie)."""
+        return np.arange(len(self.sorted)) * self.hours, self.sorted[::-1]
+
+    def merge(self, other):
+        """Monotone de l'union des deux périodes (fusion de deux tableaux triés, sans tri)."""
+        if self.hours != other.hours:
+            raise ValueError(f"Pas différents ({self.hours} h / {other.hours} h) : fusion impossible.")
+        a, b = self.sorted, other.sorted
+        merged = np.empty(len(a) + len(b))
+        pos_b = np.searchsorted(a, b, side='right') + np.arange(len(b))
+        mask = np.zeros(len(merged), dtype=bool)
+        mask[pos_b] = True
+        merged[pos_b] = b
+        merged[~mask] = a
+        return DurationCurve(merged, self.hours, presorted=True)
+
+
+class DurationSketch:
+    """
+    Monotone approchée en flux : histogramme à pas fixe (`bin_width` MW), fusionnable
+    par simple addition des comptes. Mémoire O(étendue / bin_width) quel que soit le
+    nombre de pas ; erreur bornée par `bin_width` sur les valeurs (quantiles, seuils).
+    """
+
+    def __init__(self, bin_width=1.0, hours=1.0):
+        self.bin_width = bin_width
+        self.hours = hours
+        self.origin = 0  # numéro du premier bac
+        self.counts = np.zeros(0, dtype='int64')
+        self._cumul = None
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs (ex. une année, un lot de scénarios aplati)."""
+        values = np.asarray(values, dtype='float64').ravel()
+        bins = np.floor(values[~np.isnan(values)] / self.bin_width).astype('int64')
+        if len(bins) == 0:
+            return self
+        self._add(int(bins.min()), np.bincount(bins - bins.min()))
+        return self
+
+    def _add(self, origin, counts):
+        if len(self.counts) == 0:
+            self.origin, self.counts = origin, counts.astype('int64')
+        else:
+            lo = min(self.origin, origin)
+            hi = max(self.origin + len(self.counts), origin + len(counts))
+            total = np.zeros(hi - lo, dtype='int64')
+            total[self.origin - lo:self.origin - lo + len(self.counts)] += self.counts
+            total[origin - lo:origin - lo + len(counts)] += counts
+            self.origin, self.counts = lo, total
+        self._cumul = None
+
+    def merge(self, other):
+        """Somme de deux sketches (même bin_width et même pas)."""
+        if (self.bin_width, self.hours) != (other.bin_width, other.hours):
+            raise ValueError("Sketches incompatibles (bin_width ou pas différents).")
+        merged = DurationSketch(self.bin_width, self.hours)
+        merged._add(self.origin, self.counts)
+        merged._add(other.origin, other.counts)
+        return merged
+
+    @property
+    def cumul(self):
+        if self._cumul is None:
+            self._cumul = np.cumsum(self.counts)
+        return self._cumul
+
+    def __len__(self):
+        return int(self.cumul[-1]) if len(self.counts) else 0
+
+    @property
+    def total_hours(self):
+        return len(self) * self.hours
+
+    def _bin(self, threshold):
+        return np.floor(np.asarray(threshold, dtype='float64') / self.bin_width).astype('int64') - self.origin
+
+    def hours_above(self, threshold):
+        """Heures au-dessus de `threshold` (comptes des bacs situés au-dessus du bac du seuil)."""
+        b = np.clip(self._bin(threshold), -1, len(self.counts) - 1)
+        below = np.where(b >= 0, self.cumul[np.maximum(b, 0)], 0)
+        return (len(self) - below) * self.hours
+
+    def hours_below(self, threshold):
+        b = np.clip(self._bin(threshold), 0, len(self.counts))
+        below = np.where(b > 0, self.cumul[np.maximum(b - 1, 0)], 0)
+        return below * self.hours
+
+    def quantile(self, q):
+        """Quantile(s) approché(s) : centre du bac contenant le rang (recherche O(log bacs))."""
+        rank = np.asarray(q, dtype='float64') * (len(self) - 1)
+        b = np.searchsorted(self.cumul, rank, side='right')
+        return (self.origin + b + 0.5) * self.bin_width
+
+    def value_at_hours(self, hours):
+        rank = np.clip(np.ceil(np.asarray(hours) / self.hours), 1, len(self))
+        return self.quantile((len(self) - rank) / max(len(self) - 1, 1))
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+from src.resolution import SMOOTHING_WINDOW, resolution_step, step_durations, step_hours
+from src.schema import with_derived
+from src.derived_cache import get_store
+
+# Catalogue par défaut (seuils en MW) : épisodes de déficit, pointes d'import > 4 GW,
+# rampes de charge résiduelle et chutes de production (ex. Noël) sous la moyenne 7 jours
+DEFAULT_IMPORT_PEAK_MW = 4000
+DEFAULT_RAMP_MW_PER_HOUR = 1000
+DEFAULT_DROP_FRACTION = 0.2
+
+EVENT_COLUMNS = ['Kind', 'Column', 'Start', 'End', 'Duration_Hours', 'Peak_MW', 'Mean_MW', 'Excess_MWh']
+
+
+def runs(mask, breaks=None):
+    """
+    Encodage par plages (RLE) vectorisé : (débuts, fins exclusives) des séries de True.
+    `breaks` : positions où une série doit être coupée (trou dans l'index temporel).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.r_[0, mask.astype('int8'), 0])
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if breaks is not None and len(breaks):
+        # Série à cheval sur un trou : une fin et un début supplémentaires à la rupture
+        cut = breaks[mask[breaks - 1] & mask[breaks]]
+        starts, stops = np.sort(np.r_[starts, cut]), np.sort(np.r_[stops, cut])
+    return starts, stops
+
+
+def _segment_reduce(ufunc, values, starts, stops):
+    """ufunc.reduceat sur les seuls segments [début, fin) (valeurs entre segments ignorées)."""
+    if len(starts) == 0:
+        return np.empty(0)
+    padded = np.r_[values, values[-1]]  # fin exclusive = len(values) reste un indice valide
+    return ufunc.reduceat(padded, np.ravel(np.column_stack([starts, stops])))[::2]
+
+
+class EventIndex:
+    """
+    Événements détectés (un par ligne) indexés par un IntervalIndex [début, fin) :
+    les requêtes par période (chevauchement), instant, type et durée sont vectorisées.
+    """
+
+    def __init__(self, events):
+        events = events.sort_values('Start', kind='stable', ignore_index=True)
+        self.events = events
+        self.intervals = pd.IntervalIndex.from_arrays(events['Start'], events['End'], closed='left')
+
+    def __len__(self):
+        return len(self.events)
+
+    def merge(self, other):
+        return EventIndex(pd.concat([self.events, other.events], ignore_index=True))
+
+    def query(self, kind=None, column=None, start=None, end=None, min_hours=None, max_hours=None):
+        """
+        Événements d'un type (`kind`, ou liste), qui chevauchent [start, end) et dont la durée
+        est comprise entre `min_hours` et `max_hours`.
+        Ex. query('deficit', start='2015', end='2026', min_hours=72).
+        """
+        keep = np.ones(len(self.events), dtype=bool)
+        if kind is not None:
+            keep &= self.events['Kind'].isin(np.atleast_1d(kind)).to_numpy()
+        if column is not None:
+            keep &= (self.events['Column'] == column).to_numpy()
+        if min_hours is not None:
+            keep &= (self.events['Duration_Hours'] >= min_hours).to_numpy()
+        if max_hours is not None:
+            keep &= (self.events['Duration_Hours'] <= max_hours).to_numpy()
+        if start is not None or end is not None:
+            lo = pd.Timestamp(start) if start is not None else self.intervals.left.min()
+            hi = pd.Timestamp(end) if end is not None else self.intervals.right.max()
+            keep &= self.intervals.overlaps(pd.Interval(lo, hi, closed='left'))
+        return self.events[keep]
+
+    def at(self, timestamp):
+        """Événements en cours à l'instant `timestamp`."""
+        return self.events[self.intervals.contains(pd.Timestamp(timestamp))]
+
+    def summary(self):
+        """Nombre, durée totale et plus long épisode par type d'événement."""
+        return self.events.groupby('Kind').agg(
+            Count=('Duration_Hours', 'size'),
+            Total_Hours=('Duration_Hours', 'sum'),
+            Longest_Hours=('Duration_Hours', 'max'),
+            Peak_MW=('Peak_MW', lambda s: s.abs().max()),
+        )
+
+
+class EventDetector:
+    """
+    Détection d'épisodes sur le DataFrame du Loader (Residual_Load_MW, Import_Total_MW,
+    Production_MW...) : dépassements de seuil, rampes et chutes sous une moyenne glissante.
+    Chaque détecteur produit un masque booléen vectorisé puis un encodage par plages ;
+    un trou dans l'index temporel coupe toujours un épisode.
+
+    Les ruptures se calculent sur les instants UTC (index local naïf, fuseau `tz`) : le saut
+    de printemps (01:00 -> 03:00) n'est pas un trou. Les durées suivent Samples_15min :
+    l'heure longue d'automne (une seule étiquette pour ses deux passages) dure 2 h.
+    """
+
+    def __init__(self, df, resolution=None, tz='Europe/Zurich'):
+        self.df = with_derived(df, ['Residual_Load_MW'])
+        self.step = resolution_step(df, resolution)
+        self.hours = step_hours(self.step)
+        self.index = pd.DatetimeIndex(df.index)
+        # Intervalle UTC de chaque pas : du 1er passage (heure d'été) à la fin du 2e si l'étiquette est ambiguë
+        local = self.index.as_unit('ns')
+        self.utc_start = local.tz_localize(tz, ambiguous=True, nonexistent='shift_forward').asi8
+        self.utc_end = local.tz_localize(tz, ambiguous=False, nonexistent='shift_forward').asi8 + self.step.value
+        # Ruptures : pas qui ne commence pas à la fin du précédent (les passages d'automne se chevauchent)
+        gaps = self.utc_start[1:] > self.utc_end[:-1]
+        self.breaks = np.flatnonzero(gaps) + 1
+        # Durée couverte par chaque pas (h) : Samples_15min si présent, sinon son intervalle UTC
+        if 'Samples_15min' in self.df.columns:
+            self.durations = step_durations(self.df)
+        else:
+            self.durations = (self.utc_end - self.utc_start) / 3600e9
+
+    def _episodes(self, kind, column, mask, excess, values=None):
+        """
+        Table des épisodes d'un masque ; `excess` : écart signé au seuil (MW) à chaque pas,
+        `values` : série résumée par Peak_MW / Mean_MW (par défaut la colonne elle-même).
+        """
+        starts, stops = runs(mask, self.breaks)
+        if values is None:
+            values = self.df[column].to_numpy(dtype='float64')
+        sums = _segment_reduce(np.add, values, starts, stops)
+        highs = _segment_reduce(np.maximum, values, starts, stops)
+        lows = _segment_reduce(np.minimum, values, starts, stops)
+        lengths = stops - starts
+        # Pointe : valeur la plus éloignée du seuil dans le sens de l'événement
+        upward = _segment_reduce(np.add, excess, starts, stops) >= 0
+        return pd.DataFrame({
+            'Kind': kind,
+            'Column': column,
+            'Start': self.index[starts],
+            'End': self.index[stops - 1] + self.step,
+            'Duration_Hours': _segment_reduce(np.add, self.durations, starts, stops),
+            'Peak_MW': np.where(upward, highs, lows),
+            'Mean_MW': sums / np.maximum(lengths, 1),
+            'Excess_MWh': _segment_reduce(np.add, excess * self.durations, starts, stops),
+        }, columns=EVENT_COLUMNS)
+
+    def above(self, column, threshold, kind=None, min_hours=0):
+        """Épisodes où `column` dépasse strictement `threshold`."""
+        values = self.df[column].to_numpy(dtype='float64')
+        events = self._episodes(kind or f'{column}>{threshold:g}', column, values > threshold, values - threshold)
+        return events[events['Duration_Hours'] >= min_hours]
+
+    def below(self, column, threshold, kind=None, min_hours=0):
+        """Épisodes où `column` est strictement sous `threshold` (Excess_MWh négatif)."""
+        values = self.df[column].to_numpy(dtype='float64')
+        events = self._episodes(kind or f'{column}<{threshold:g}', column, values < threshold, values - threshold)
+        return events[events['Duration_Hours'] >= min_hours]
+
+    def ramps(self, column, mw_per_hour, kind=None):
+        """
+        Rampes : pas où la variation dépasse `mw_per_hour` (en valeur absolue), regroupées
+        en épisodes de même sens. Pour ces épisodes, Peak_MW / Mean_MW sont la pente maximale
+        et moyenne (MW/h) et Excess_MWh la variation totale x durée du pas.
+        """
+        values = self.df[column].to_numpy(dtype='float64')
+        rate = np.r_[0.0, np.diff(values)] / self.hours
+        rate[self.breaks] = 0.0  # pas de rampe à travers un trou
+        kind = kind or f'ramp:{column}'
+        up = self._episodes(f'{kind}:up', column, rate > mw_per_hour, rate, values=rate)
+        down = self._episodes(f'{kind}:down', column, rate < -mw_per_hour, rate, values=rate)
+        return pd.concat([up, down], ignore_index=True)
+
+    def drops(self, column, fraction=DEFAULT_DROP_FRACTION, window=SMOOTHING_WINDOW, kind=None):
+        """
+        Chutes anormales : `column` sous (1 - fraction) x sa moyenne glissante centrée
+        (`window`, la même que les graphes "MA7", lue dans le store partagé).
+        Excess_MWh = énergie manquante par rapport à la moyenne glissante.
+        """
+        values = self.df[column].to_numpy(dtype='float64')
+        baseline = get_store(self.df).rolling_mean(column, window, self.step).to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            mask = values < (1 - fraction) * baseline
+        return self._episodes(kind or f'drop:{column}', column, mask, np.nan_to_num(values - baseline))
+
+    def detect(self, import_peak_mw=DEFAULT_IMPORT_PEAK_MW, ramp_mw_per_hour=DEFAULT_RAMP_MW_PER_HOUR,
+               drop_fraction=DEFAULT_DROP_FRACTION):
+        """Catalogue par défaut, réuni dans un EventIndex."""
+        tables = [self.above('Residual_Load_MW', 0, kind='deficit')]
+        if 'Import_Total_MW' in self.df.columns:
+            tables.append(self.above('Import_Total_MW', import_peak_mw, kind='import_peak'))
+        tables.append(self.ramps('Residual_Load_MW', ramp_mw_per_hour, kind='ramp'))
+        tables.append(self.drops('Production_MW', drop_fraction, kind='production_drop'))
+        return EventIndex(pd.concat(tables, ignore_index=True))
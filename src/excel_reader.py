@@ -0,0 +1,48 @@
+import pandas as pd
+import numpy as np
+from operator import itemgetter
+from src.headers import resolve_swissgrid_columns
+
+
+def read_swissgrid_streaming(filepath, sheet_name='Zeitreihen0h15', min_row=2):
+    """
+    Lecture en flux (openpyxl read-only) : seules les colonnes résolues sont extraites,
+    ligne par ligne, dans des tableaux NumPy pré-alloués (int64 ns / float32 kWh).
+    `min_row` (1-indexé) permet de ne lire que la fin de la feuille (ingestion incrémentale).
+    Renvoie (timestamps, valeurs, noms des colonnes).
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name]
+        columns = resolve_swissgrid_columns(next(ws.iter_rows(max_row=1, values_only=True)))
+        rows = ws.iter_rows(min_row=max(min_row, 2), values_only=True)
+        names = list(columns)
+        pick_values = itemgetter(*columns.values())
+
+        # max_row peut être absent en read-only : on agrandit le tampon si besoin
+        capacity = max((ws.max_row or 40_000) - min_row + 1, 1)
+        raw_ts = np.empty(capacity, dtype=object)
+        values = np.full((capacity, len(names)), np.nan, dtype='float32')
+
+        n = 0
+        for row in rows:
+            if n == capacity:
+                capacity *= 2
+                raw_ts = np.resize(raw_ts, capacity)
+                values = np.resize(values, (capacity, len(names)))
+            raw_ts[n] = row[0]
+            # Ligne des unités (kWh) ou cellule vide -> NaN
+            values[n] = [v if isinstance(v, (int, float)) else np.nan for v in pick_values(row)]
+            n += 1
+    finally:
+        wb.close()
+
+    raw_ts, values = raw_ts[:n], values[:n]
+    if all(isinstance(t, str) for t in raw_ts[:10]):
+        timestamps = pd.to_datetime(raw_ts, format='%d.%m.%Y %H:%M', errors='coerce')
+    else:
+        timestamps = pd.to_datetime(raw_ts, dayfirst=True, errors='coerce')
+    timestamps = np.asarray(timestamps, dtype='datetime64[ns]').view('int64')
+    return timestamps, values, names
@@ -0,0 +1,197 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+from src.kpi import winter_gap_kpis
+from src.resolution import interval_start, step_durations
+from src.schema import compact as compact_frame, with_derived
+from src.profiling import profiled
+
+# Arborescence d'export (partitionnement "Hive", lisible par pyarrow, DuckDB, Spark, Polars...) :
+#   <root>/timeseries/Year=2025/Month=01/part-0.parquet   DataFrame du Loader, un dossier par mois
+#   <root>/kpis/annual.parquet                             KPIs Winter Gap, une ligne par année
+#   <root>/kpis/monthly.parquet                            énergie à importer par mois
+# Les colonnes Year / Month ne sont que dans les chemins : un lecteur qui filtre sur
+# elles n'ouvre que les dossiers concernés.
+FORMATS = ('parquet', 'csv')
+
+
+def _partition_dir(root, year, month):
+    return os.path.join(root, f'Year={year}', f'Month={month:02d}')
+
+
+class DatasetWriter:
+    """
+    Écriture en flux d'un DataFrame horodaté (en un ou plusieurs morceaux successifs)
+    vers un jeu de données partitionné par année / mois. Chaque morceau est découpé par
+    mois et ajouté au fichier ouvert de la partition : la mémoire reste bornée par la
+    taille d'un morceau, quel que soit le nombre d'années.
+
+    Les fichiers d'une partition sont remplacés à sa première écriture (ré-export d'un
+    mois) ; les autres partitions du dossier sont conservées (ajout d'une nouvelle période).
+    """
+
+    def __init__(self, root, fmt='parquet', compact=False, resolution=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format d'export non supporté : {fmt} (attendu : {', '.join(FORMATS)})")
+        self.root = root
+        self.fmt = fmt
+        # Schéma compact (float32, cf. schema.py) : fichiers ~2x plus petits
+        self.compact = compact
+        self.resolution = resolution
+        self.rows = 0
+        self.partitions = set()
+        self._writers = {}   # partition ouverte -> writer Parquet ou fichier CSV
+        self._parts = {}     # partition -> nombre de fichiers déjà écrits
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, df):
+        """
+        Ajoute un morceau (index = Timestamp), supposé postérieur aux précédents. Les colonnes
+        dérivées (cumul financier compris) doivent déjà être calculées sur la série complète.
+        Partition d'un pas : mois de son début d'intervalle (cf. resolution.interval_start).
+        """
+        if df.empty:
+            return self
+        if self.compact:
+            df = compact_frame(df)
+        ts = interval_start(df, self.resolution)
+        df = df.reset_index()
+        keys = ts.year.to_numpy() * 100 + ts.month.to_numpy()
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        for start, stop in zip(starts, np.r_[starts[1:], len(df)]):
+            year, month = divmod(int(keys[start]), 100)
+            self._append((year, month), df.iloc[start:stop])
+            self.partitions.add((year, month))
+
+        # Les données arrivent dans l'ordre : les mois antérieurs au morceau sont terminés
+        first = divmod(int(keys.min()), 100)
+        for key in [k for k in self._writers if k < first]:
+            self._close_partition(key)
+        self.rows += len(df)
+        return self
+
+    def _append(self, key, chunk):
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._open_partition(key, chunk)
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+        else:
+            chunk.to_csv(writer, header=writer.tell() == 0, index=False, date_format='%Y-%m-%d %H:%M:%S')
+
+    def _open_partition(self, key, chunk):
+        directory = _partition_dir(self.root, *key)
+        if key not in self._parts:
+            # Première écriture de la partition : on remplace un éventuel export précédent
+            os.makedirs(directory, exist_ok=True)
+            for old in glob.glob(os.path.join(directory, 'part-*')):
+                os.remove(old)
+        part = self._parts.get(key, 0)  # une partition rouverte (données tardives) -> fichier suivant
+        self._parts[key] = part + 1
+        path = os.path.join(directory, f'part-{part}.{self.fmt}')
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(path, pa.Schema.from_pandas(chunk, preserve_index=False))
+        else:
+            writer = open(path, 'w', newline='')
+        self._writers[key] = writer
+        return writer
+
+    def _close_partition(self, key):
+        self._writers.pop(key).close()
+
+    def close(self):
+        for key in list(self._writers):
+            self._close_partition(key)
+
+
+def kpi_tables(df, resolution=None):
+    """
+    KPIs Winter Gap (noyau src.kpi) : une ligne par année, et l'énergie à importer
+    par mois (colonnes Year, Month, Deficit_GWh). Années et mois sont ceux du début
+    d'intervalle de chaque pas (le dernier quart d'heure d'une année reste dans cette année).
+    """
+    hours = step_durations(df, resolution)
+    starts = interval_start(df, resolution)
+    years = starts.year
+    annual = []
+    for year in np.unique(years):
+        in_year = years == year
+        part = df[in_year]
+        kpis = winter_gap_kpis(part['Production_MW'].to_numpy(), part['Consumption_MW'].to_numpy(),
+                               hours=hours[in_year]).to_frame()
+        kpis.insert(0, 'Year', int(year))
+        kpis['Hours'] = hours[in_year].sum()
+        annual.append(kpis)
+    annual = pd.concat(annual, ignore_index=True)
+
+    kpis = winter_gap_kpis(df['Production_MW'].to_numpy(), df['Consumption_MW'].to_numpy(),
+                           index=starts, hours=hours)
+    monthly = pd.DataFrame({
+        'Year': kpis.months.year,
+        'Month': kpis.months.month,
+        'Deficit_GWh': np.atleast_1d(kpis.monthly_deficit_gwh),
+    })
+    return annual, monthly
+
+
+@profiled('export.export_dataset')
+def export_dataset(df, root, fmt='parquet', compact=False, chunk_rows=100_000, resolution=None):
+    """
+    Export complet : série temporelle partitionnée (écrite par morceaux de `chunk_rows`
+    lignes) et tables de KPIs. Renvoie le nombre de lignes exportées.
+    """
+    print(f"Export ({fmt}) : {root}")
+    df = with_derived(df)
+    with DatasetWriter(os.path.join(root, 'timeseries'), fmt, compact=compact, resolution=resolution) as writer:
+        for start in range(0, len(df), chunk_rows):
+            writer.write(df.iloc[start:start + chunk_rows])
+
+    annual, monthly = kpi_tables(df, resolution)
+    os.makedirs(os.path.join(root, 'kpis'), exist_ok=True)
+    for name, table in (('annual', annual), ('monthly', monthly)):
+        path = os.path.join(root, 'kpis', f'{name}.{fmt}')
+        if fmt == 'parquet':
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+    print(f"✅ {writer.rows} lignes exportées ({len(writer.partitions)} partitions mensuelles), "
+          f"KPIs : {len(annual)} année(s).")
+    return writer.rows
+
+
+def read_dataset(root, columns=None, years=None, months=None):
+    """
+    Relit la série exportée (dossier `root` ou `root/timeseries`) en ne lisant que les
+    partitions des `years` / `months` demandés et, en Parquet, que les `columns` demandées.
+    Renvoie un DataFrame indexé par Timestamp, comme celui du Loader.
+    """
+    if os.path.isdir(os.path.join(root, 'timeseries')):
+        root = os.path.join(root, 'timeseries')
+    wanted = None if columns is None else ['Timestamp'] + [c for c in columns if c != 'Timestamp']
+
+    paths = []
+    for directory in sorted(glob.glob(os.path.join(root, 'Year=*', 'Month=*'))):
+        year = int(os.path.basename(os.path.dirname(directory)).split('=')[1])
+        month = int(os.path.basename(directory).split('=')[1])
+        if (years is None or year in years) and (months is None or month in months):
+            paths.extend(sorted(glob.glob(os.path.join(directory, 'part-*'))))
+    if not paths:
+        print(f"⚠️ Aucune partition à lire dans {root}")
+        return None
+
+    frames = []
+    for path in paths:
+        if path.endswith('.parquet'):
+            frames.append(pd.read_parquet(path, columns=wanted))
+        else:
+            frames.append(pd.read_csv(path, usecols=wanted, parse_dates=['Timestamp']))
+    return pd.concat(frames, ignore_index=True).set_index('Timestamp').sort_index()
@@ -2,8 +2,24 @@ import pandas as pd
 import numpy as np
 
 class SwissGridGenerator:
-    def __init__(self, year=2025):
+    # Profils saisonniers (MW) : base + amplitude * cos(2*pi*h/8760), bruit gaussien
+    CONSO_BASE, CONSO_AMPLITUDE, CONSO_NOISE = 6000, 1500, 200
+    PROD_BASE, PROD_AMPLITUDE, PROD_NOISE = 5800, -2000, 300
+
+    def __init__(self, year=2025, seed=None):
         self.year = year
+        # Générateur numpy dédié : seed fixe -> année reproductible
+        self.rng = np.random.default_rng(seed)
+
+    def dates(self):
+        return pd.date_range(start=f'{self.year}-01-01', end=f'{self.year}-12-31 23:00', freq='h')
+
+    def seasonal_profiles(self, n_hours):
+        """Profils moyens (sans bruit) de consommation et de production, en MW."""
+        phase = np.arange(n_hours) * 2 * np.pi / 8760
+        consumption = self.CONSO_BASE + self.CONSO_AMPLITUDE * np.cos(phase)
+        production = self.PROD_BASE + self.PROD_AMPLITUDE * np.cos(phase)
+        return consumption, production
 
     def generate_year_data(self):
         """
@@ -11,24 +27,34 @@ class SwissGridGenerator:
         Hiver : Conso > Prod (Déficit). Été : Prod > Conso (Surplus).
         """
         # Création de l'axe temporel (heures)
-        dates = pd.date_range(start=f'{self.year}-01-01', end=f'{self.year}-12-31 23:00', freq='h')
-        hours = np.arange(len(dates))
+        dates = self.dates()
         
         # Consommation : Pic en hiver (Chauffage), Creux en été
-        conso_base = 6000
-        conso_seasonality = 1500 * np.cos((hours) * 2 * np.pi / 8760) 
-        noise_conso = np.random.normal(0, 200, len(dates))
-        consumption = conso_base + conso_seasonality + noise_conso
-
         # Production (Hydro) : Pic en été (Fonte des neiges), Creux en hiver
-        prod_base = 5800
-        prod_seasonality = -2000 * np.cos((hours) * 2 * np.pi / 8760)
-        noise_prod = np.random.normal(0, 300, len(dates))
-        production = prod_base + prod_seasonality + noise_prod
+        conso_mean, prod_mean = self.seasonal_profiles(len(dates))
+        consumption = conso_mean + self.rng.normal(0, self.CONSO_NOISE, len(dates))
+        production = prod_mean + self.rng.normal(0, self.PROD_NOISE, len(dates))
 
         # Assemblage dans un DataFrame
         df = pd.DataFrame(index=dates)
         df['Consumption_MW'] = consumption
         df['Production_MW'] = production
         
-        return df
\ No newline at end of file
+        return df
+
+    def generate_scenarios(self, n_scenarios, rng=None, dtype='float32'):
+        """
+        N années stochastiques d'un coup, sans DataFrame : deux tableaux (N, heures)
+        de consommation et de production (MW). `rng` : numpy.random.Generator (défaut : self.rng).
+        """
+        rng = rng or self.rng
+        n_hours = len(self.dates())
+        conso_mean, prod_mean = self.seasonal_profiles(n_hours)
+        shape = (n_scenarios, n_hours)
+        consumption = rng.standard_normal(shape, dtype=dtype)
+        consumption *= self.CONSO_NOISE
+        consumption += conso_mean.astype(dtype)
+        production = rng.standard_normal(shape, dtype=dtype)
+        production *= self.PROD_NOISE
+        production += prod_mean.astype(dtype)
+        return consumption, production
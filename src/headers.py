@@ -0,0 +1,96 @@
+import re
+from functools import lru_cache
+
+NEIGHBORS = ['DE', 'FR', 'IT', 'AT']
+
+
+class SchemaError(ValueError):
+    """En-têtes d'un fichier source non reconnus (colonne obligatoire introuvable)."""
+
+
+def _patterns(*regexes):
+    return [re.compile(r, re.IGNORECASE) for r in regexes]
+
+
+# Variantes historiques des en-têtes de la feuille 'Zeitreihen0h15' (libellés allemand
+# et anglais, sur une ou deux lignes selon les années). Compilées une fois à l'import.
+_ARROW = r'\s*(?:->|→|>)\s*'
+SWISSGRID_PATTERNS = {
+    # \b : "endverbrauchte Energie" (colonne 1) ne doit pas être prise pour la consommation
+    'Production_kWh': _patterns(r'\bproduzierte Energie', r'Total energy production'),
+    'Consumption_kWh': _patterns(r'\bverbrauchte Energie Regelblock', r'Total energy consumption\b'),
+    **{name: _patterns(pattern) for code in NEIGHBORS
+       for name, pattern in [(f'Export_{code}_kWh', rf'\bCH{_ARROW}{code}\b'),
+                             (f'Import_{code}_kWh', rf'\b{code}{_ARROW}CH\b')]},
+    'Import_Total_kWh': _patterns(r'^\s*Importe?\b'),
+    'Export_Total_kWh': _patterns(r'^\s*Exporte?\b'),
+    'Transit_kWh': _patterns(r'^\s*Transit\b'),
+}
+# Positions historiques de Prod/Conso quand le libellé n'est pas reconnu
+POSITION_FALLBACK = {'Production_kWh': 2, 'Consumption_kWh': 3}
+REQUIRED = ['Production_kWh', 'Consumption_kWh', 'Import_Total_kWh', 'Export_Total_kWh']
+
+
+def _normalize(headers):
+    return tuple(' '.join(str(h).split()) if h is not None else '' for h in headers)
+
+
+@lru_cache(maxsize=32)
+def _resolve_swissgrid(headers):
+    columns = {}
+    for name, patterns in SWISSGRID_PATTERNS.items():
+        pos = next((i for i, h in enumerate(headers) if any(p.search(h) for p in patterns)), None)
+        if pos is None and name in POSITION_FALLBACK and len(headers) > POSITION_FALLBACK[name]:
+            pos = POSITION_FALLBACK[name]
+        if pos is not None:
+            columns[name] = pos
+
+    # Une frontière n'est utilisable qu'avec ses deux sens
+    for code in NEIGHBORS:
+        if (f'Export_{code}_kWh' in columns) != (f'Import_{code}_kWh' in columns):
+            columns.pop(f'Export_{code}_kWh', None)
+            columns.pop(f'Import_{code}_kWh', None)
+
+    missing = [name for name in REQUIRED if name not in columns]
+    if missing:
+        raise SchemaError(f"❌ En-têtes Swissgrid non reconnus : {', '.join(missing)} introuvable(s) "
+                          f"parmi {list(headers)}")
+    return tuple(columns.items())
+
+
+def resolve_swissgrid_columns(headers):
+    """
+    Résout une seule fois par schéma de fichier (cache) les colonnes utiles de la feuille
+    'Zeitreihen0h15'. Renvoie {nom canonique: position}, dans un ordre stable.
+    Lève SchemaError si une colonne obligatoire (Prod, Conso, Import, Export) manque.
+    """
+    return dict(_resolve_swissgrid(_normalize(headers)))
+
+
+# Fichiers de prix : colonne de date, puis colonnes de prix par zone (CH par défaut)
+DATE_PATTERNS = _patterns(r'Datum', r'Date', r'Zeit', r'Time')
+PRICE_PATTERNS = _patterns(r'Baseload', r'Price', r'Preis', r'EUR')
+
+
+@lru_cache(maxsize=32)
+def _resolve_prices(headers, areas):
+    date_col = next((h for h in headers if any(p.search(h) for p in DATE_PATTERNS)), headers[0])
+    prices = {}
+    for col in headers:
+        if col == date_col:
+            continue
+        tokens = set(re.split(r'[^A-Za-z]+', col.upper()))
+        area = next((a for a in areas if a in tokens), None)
+        if area is None and any(p.search(col) for p in PRICE_PATTERNS):
+            area = 'CH'  # colonne de prix sans zone explicite = prix suisse
+        if area is not None and area not in prices:
+            prices[area] = col
+    if not prices:
+        raise SchemaError(f"❌ Aucune colonne de prix reconnue parmi {list(headers)}")
+    return date_col, tuple(prices.items())
+
+
+def resolve_price_columns(headers, areas):
+    """(colonne de date, {zone: colonne de prix}) d'un fichier de prix, résolu une fois par schéma."""
+    date_col, prices = _resolve_prices(tuple(str(h) for h in headers), tuple(areas))
+    return date_col, dict(prices)
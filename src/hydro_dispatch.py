@@ -0,0 +1,200 @@
+import os
+import matplotlib.pyplot as plt
+import seaborn as sns
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from src.resolution import resolution_step, step_durations, step_hours
+from src.schema import with_derived
+from src.rendering import finish
+from src.profiling import profiled
+
+# Objectifs supportés : minimiser les imports ou maximiser le revenu spot
+OBJECTIVES = ('imports', 'revenue')
+
+
+def seasonal_inflow(index, annual_gwh):
+    """
+    Apports naturels (MW) d'un bassin alpin : fonte des neiges avec pic fin juin,
+    quasi nuls en hiver. L'énergie totale sur l'index vaut `annual_gwh`.
+    """
+    index = pd.DatetimeIndex(index)
+    weight = 1 + np.cos(2 * np.pi * (index.dayofyear.to_numpy() - 172) / 365.25)
+    hours = step_hours(resolution_step(pd.DataFrame(index=index)))
+    return annual_gwh * 1000 * weight / (weight.sum() * hours)
+
+
+class HydroDispatchOptimizer:
+    """
+    Dispatch optimal d'un réservoir (turbinage / pompage) sur la charge résiduelle
+    et le prix spot du Loader, résolu en programme linéaire creux (scipy / HiGHS).
+
+    Variables par pas t : turbinage g_t (MW), pompage p_t (MW), déversement v_t (MWh),
+    niveau S_t (MWh, fin de pas) et, pour l'objectif 'imports', l'import restant s_t (MW).
+    Bilan : S_t = S_{t-1} + (apport_t - g_t + rendement * p_t) * h - v_t
+    Le réservoir doit finir l'année au moins à son niveau initial.
+    """
+
+    def __init__(self, df, capacity_mwh=1_000_000, turbine_mw=2000, pump_mw=1000, efficiency=0.8,
+                 inflow_mw=None, annual_inflow_gwh=3000, initial_fraction=0.5, objective='imports',
+                 resolution=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objectif inconnu : {objective} (attendu : {', '.join(OBJECTIVES)})")
+        self.df = with_derived(df, ['Residual_Load_MW'])
+        self.hours = step_durations(self.df, resolution)  # durée de chaque pas (h)
+        self.capacity_mwh = capacity_mwh
+        self.turbine_mw = turbine_mw
+        self.pump_mw = pump_mw
+        self.efficiency = efficiency
+        self.initial_fraction = initial_fraction
+        self.objective = objective
+        if inflow_mw is None:
+            inflow_mw = seasonal_inflow(self.df.index, annual_inflow_gwh)
+        self.inflow_mw = np.broadcast_to(np.asarray(inflow_mw, dtype='float64'), (len(self.df),))
+        self.result = None
+
+    def _build_lp(self):
+        from scipy import sparse
+
+        n, h = len(self.df), self.hours
+        residual = self.df['Residual_Load_MW'].to_numpy(dtype='float64')
+        price = (self.df['Price_EUR'].to_numpy(dtype='float64') if 'Price_EUR' in self.df.columns
+                 else np.zeros(n))
+        with_imports = self.objective == 'imports'
+        n_blocks = 5 if with_imports else 4
+        # Blocs de variables : [g, p, v, S, (s)]
+        g, p, v, s_level, s_imp = (np.arange(n) + k * n for k in range(5))
+        eye = sparse.identity(n, format='csr')
+
+        # Bilan : S_t - S_{t-1} + h*g_t - h*eta*p_t + v_t = h*apport_t (+ S_0 au premier pas)
+        diff = eye - sparse.eye(n, k=-1, format='csr')
+        h_diag = sparse.diags(h, format='csr')
+        blocks = [h_diag, -self.efficiency * h_diag, eye, diff]
+        if with_imports:
+            blocks.append(sparse.csr_matrix((n, n)))
+        a_eq = sparse.hstack(blocks, format='csr')
+        s0 = self.initial_fraction * self.capacity_mwh
+        b_eq = h * self.inflow_mw
+        b_eq[0] += s0
+
+        # Revenu spot (€) du dispatch : prix * (g - p) * h
+        cost = np.zeros(n_blocks * n)
+        cost[g] = -price * h
+        cost[p] = price * h
+
+        a_ub = b_ub = None
+        if with_imports:
+            # Import restant : s_t >= résiduelle_t - (g_t - p_t)  <=>  -g_t + p_t - s_t <= -résiduelle_t
+            a_ub = sparse.hstack([-eye, eye, sparse.csr_matrix((n, n)), sparse.csr_matrix((n, n)), -eye],
+                                 format='csr')
+            b_ub = -residual
+            # Le revenu ne sert plus qu'à départager les solutions à imports égaux
+            cost *= 1e-6
+            cost[s_imp] = h
+
+        bounds = np.zeros((n_blocks * n, 2))
+        bounds[:, 1] = np.inf
+        bounds[g, 1] = self.turbine_mw
+        bounds[p, 1] = self.pump_mw
+        bounds[s_level, 1] = self.capacity_mwh
+        bounds[s_level[-1], 0] = s0  # niveau final >= niveau initial
+        return cost, a_ub, b_ub, a_eq, b_eq, bounds
+
+    @profiled()
+    def solve(self):
+        """Résout le dispatch sur toute la période. Renvoie un DataFrame horaire (ou 15 min)."""
+        try:
+            from scipy.optimize import linprog
+        except ImportError:
+            print("❌ ERREUR : scipy est requis pour l'optimisation du dispatch (pip install scipy).")
+            return None
+
+        n = len(self.df)
+        cost, a_ub, b_ub, a_eq, b_eq, bounds = self._build_lp()
+        res = linprog(cost, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=b_eq, bounds=bounds, method='highs')
+        if res.status != 0:
+            print(f"❌ ERREUR : dispatch non résolu ({res.message})")
+            return None
+
+        x = res.x
+        dispatch = x[:n] - x[n:2 * n]
+        self.result = pd.DataFrame({
+            'Turbine_MW': x[:n],
+            'Pump_MW': x[n:2 * n],
+            'Spill_MWh': x[2 * n:3 * n],
+            'Storage_MWh': x[3 * n:4 * n],
+            'Inflow_MW': self.inflow_mw,
+            'Residual_After_MW': self.df['Residual_Load_MW'].to_numpy(dtype='float64') - dispatch,
+        }, index=self.df.index)
+        return self.result
+
+    def summary(self):
+        """KPIs du dispatch : imports avant/après (GWh), revenu spot (M€), énergie turbinée/pompée."""
+        if self.result is None and self.solve() is None:
+            return None
+        r, h = self.result, self.hours
+        before = (self.df['Residual_Load_MW'].clip(lower=0) * h).sum() / 1000
+        after = (r['Residual_After_MW'].clip(lower=0) * h).sum() / 1000
+        price = self.df['Price_EUR'] if 'Price_EUR' in self.df.columns else 0.0
+        kpis = {
+            'Capacity_GWh': self.capacity_mwh / 1000,
+            'Imports_Before_GWh': before,
+            'Imports_After_GWh': after,
+            'Imports_Avoided_GWh': before - after,
+            'Revenue_Million_EUR': ((r['Turbine_MW'] - r['Pump_MW']) * price * h).sum() / 1_000_000,
+            'Turbined_GWh': (r['Turbine_MW'] * h).sum() / 1000,
+            'Pumped_GWh': (r['Pump_MW'] * h).sum() / 1000,
+            'Spilled_GWh': r['Spill_MWh'].sum() / 1000,
+        }
+        return {k: float(val) for k, val in kpis.items()}
+
+    @profiled()
+    def plot_dispatch(self):
+        """Niveau du réservoir et dispatch journalier (l'Effet Noël se lit sur la pente de décembre)."""
+        print("Génération Dispatch Hydro Optimal...")
+        if self.result is None and self.solve() is None:
+            return
+
+        r = self.result
+        daily = r[['Turbine_MW', 'Pump_MW', 'Inflow_MW']].resample('D').mean()
+
+        sns.set_theme(style="whitegrid")
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+
+        ax1.plot(r.index, r['Storage_MWh'] / 1000, color='#2980b9', lw=2, label="Niveau du réservoir")
+        ax1.axhline(self.capacity_mwh / 1000, color='grey', ls='--', lw=1, label="Capacité")
+        ax1.set_title(f"Dispatch Hydro Optimal (objectif : {self.objective})", fontsize=14, fontweight='bold')
+        ax1.set_ylabel("Stock (GWh)")
+        ax1.legend(loc="upper right")
+
+        ax2.fill_between(daily.index, daily['Turbine_MW'], color='#27ae60', alpha=0.5, label="Turbinage (Moy. Jour)")
+        ax2.fill_between(daily.index, -daily['Pump_MW'], color='#e74c3c', alpha=0.5, label="Pompage (Moy. Jour)")
+        ax2.plot(daily.index, daily['Inflow_MW'], color='#34495e', lw=1.5, label="Apports naturels")
+        ax2.set_ylabel("Puissance (MW)")
+        ax2.legend(loc="upper right")
+
+        plt.tight_layout()
+        finish('HydroDispatch')
+
+
+def _sweep_worker(args):
+    df, capacity_mwh, params = args
+    return HydroDispatchOptimizer(df, capacity_mwh=capacity_mwh, **params).summary()
+
+
+def sweep_capacity(df, capacities_mwh, workers=None, **params):
+    """
+    Balayage de la capacité du réservoir (un LP par capacité, répartis sur un pool
+    de processus). Renvoie un DataFrame de KPIs, une ligne par capacité.
+    """
+    capacities_mwh = list(capacities_mwh)
+    workers = min(workers or os.cpu_count(), len(capacities_mwh))
+    print(f"Balayage dispatch hydro : {len(capacities_mwh)} capacités ({workers} processus)...")
+    tasks = [(df, c, params) for c in capacities_mwh]
+
+    if workers <= 1:
+        rows = [_sweep_worker(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_sweep_worker, tasks))
+    return pd.DataFrame([r for r in rows if r is not None])
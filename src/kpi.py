@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+class WinterGapKPIs:
+    """
+    Résultat du noyau KPI. Chaque attribut a une valeur par scénario (tableaux de
+    taille N), ou un scalaire si l'entrée était une seule année (1-D).
+    - max_deficit_mw : pointe d'import en MW (positive, 0 si jamais en déficit)
+    - import_hours : heures où Conso > Prod
+    - import_gwh : énergie totale à importer
+    - longest_deficit_hours : plus longue série continue de pas en déficit (en heures)
+    - monthly_deficit_gwh : énergie à importer par mois, de forme (N, mois) ou (mois,)
+    - months : libellés des mois (Period) ou None si aucun index n'a été fourni
+    - total_hours : durée couverte par chaque scénario
+    """
+
+    def __init__(self, max_deficit_mw, import_hours, import_gwh, longest_deficit_hours,
+                 monthly_deficit_gwh, months, total_hours):
+        self.max_deficit_mw = max_deficit_mw
+        self.import_hours = import_hours
+        self.import_gwh = import_gwh
+        self.longest_deficit_hours = longest_deficit_hours
+        self.monthly_deficit_gwh = monthly_deficit_gwh
+        self.months = months
+        self.total_hours = total_hours
+
+    def to_frame(self):
+        """KPIs scalaires, une ligne par scénario."""
+        return pd.DataFrame({
+            'Max_Deficit_MW': np.atleast_1d(self.max_deficit_mw),
+            'Import_Hours': np.atleast_1d(self.import_hours),
+            'Import_GWh': np.atleast_1d(self.import_gwh),
+            'Longest_Deficit_Hours': np.atleast_1d(self.longest_deficit_hours),
+        })
+
+    def monthly_frame(self):
+        """Énergie à importer par mois (lignes = scénarios, colonnes = mois)."""
+        return pd.DataFrame(np.atleast_2d(self.monthly_deficit_gwh), columns=self.months)
+
+    def report(self, label=''):
+        """Affichage console (une seule année)."""
+        print(f"\n--- RÉSULTATS DE L'ANALYSE (Suisse {label}) ---")
+        print(f"Déficit Hivernal Max (Pointe) : {-float(self.max_deficit_mw):.2f} MW")
+        print(f"Heures d'import nécessaire    : {float(self.import_hours):.0f} h / {self.total_hours:.0f} h")
+        print(f"Volume total à importer       : {float(self.import_gwh):.2f} GWh")
+        print(f"Plus long déficit continu     : {float(self.longest_deficit_hours):.0f} h")
+        print(f"---------------------------------------------------\n")
+
+
+def _month_blocks(index, n_steps):
+    """Début de chaque bloc mensuel (index trié) et libellés des mois."""
+    if index is None:
+        return np.array([0]), None
+    periods = pd.DatetimeIndex(index).to_period('M')
+    codes = np.asarray(periods.asi8)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    return starts, periods[starts]
+
+
+def winter_gap_kpis(production, consumption, index=None, hours=1.0):
+    """
+    Noyau KPI du Winter Gap, en une passe NumPy sans filtrer de DataFrame.
+    `production` / `consumption` : MW, 1-D (une année) ou 2-D (années/scénarios x pas).
+    `index` : axe temporel des pas (pour la ventilation mensuelle), `hours` : durée d'un pas,
+    scalaire ou tableau par pas (cf. resolution.step_durations).
+    """
+    single = np.ndim(production) == 1
+    net = np.subtract(np.atleast_2d(production), np.atleast_2d(consumption), dtype='float64')
+    n_steps = net.shape[1]
+    hours = np.broadcast_to(np.asarray(hours, dtype='float64'), (n_steps,))
+    np.minimum(net, 0, out=net)  # ne garde que le déficit (négatif)
+    in_deficit = net < 0
+
+    # Plus longue série : durée courante = heures cumulées jusqu'au pas - jusqu'au dernier pas hors déficit
+    rank = np.arange(1, n_steps + 1)
+    last_reset = np.maximum.accumulate(np.where(in_deficit, 0, rank), axis=1)
+    elapsed = np.r_[0.0, np.cumsum(hours)]
+    longest = (elapsed[rank] - elapsed[last_reset]).max(axis=1, initial=0)
+
+    starts, months = _month_blocks(index, n_steps)
+    monthly = 0.0 - np.add.reduceat(net * hours, starts, axis=1) / 1000
+
+    kpis = {
+        'max_deficit_mw': 0.0 - net.min(axis=1),  # (0.0 - x : pas de -0.0)
+        'import_hours': in_deficit @ hours,
+        'import_gwh': monthly.sum(axis=1),
+        'longest_deficit_hours': longest,
+        'monthly_deficit_gwh': monthly,
+    }
+    if single:
+        kpis = {k: (v[0] if k == 'monthly_deficit_gwh' else v[0].item()) for k, v in kpis.items()}
+    return WinterGapKPIs(months=months, total_hours=float(hours.sum()), **kpis)
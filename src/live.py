@@ -0,0 +1,255 @@
+import time
+import socket
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.headers import NEIGHBORS, resolve_swissgrid_columns
+from src.aggregation import LocalClock
+from src.resolution import SMOOTHING_WINDOW, freq_to_timedelta
+from src.prices import PriceAligner
+
+# Colonnes lissées suivies en direct (les mêmes que dans les graphes "MA7")
+ROLLING_COLUMNS = ['Consumption_MW', 'Production_MW', 'Total_Flux_MW', 'Transit_MW'] + \
+                  [f'Net_Flow_{code}_MW' for code in NEIGHBORS]
+
+
+# --- SOURCES : lignes de texte au format de la feuille Zeitreihen0h15 exportée en CSV ---
+
+def tail_lines(filepath, follow=False, poll=1.0):
+    """Lignes d'un CSV ; avec `follow`, attend les lignes ajoutées (comme `tail -f`)."""
+    with open(filepath, encoding='utf-8-sig') as f:
+        pending = ''
+        while True:
+            line = f.readline()
+            if line.endswith('\n'):
+                yield pending + line
+                pending = ''
+            elif line:
+                pending += line  # ligne en cours d'écriture
+            elif follow:
+                time.sleep(poll)
+            else:
+                if pending:
+                    yield pending
+                return
+
+
+def socket_lines(host, port):
+    """Lignes reçues sur une socket TCP locale (jusqu'à fermeture par l'émetteur)."""
+    with socket.create_connection((host, port)) as sock, sock.makefile('r', encoding='utf-8') as f:
+        yield from f
+
+
+def open_feed(source, follow=False, poll=1.0):
+    """'tcp://hôte:port' -> socket, sinon chemin d'un CSV (suivi si `follow`)."""
+    if source.startswith('tcp://'):
+        host, port = source[len('tcp://'):].rsplit(':', 1)
+        return socket_lines(host, int(port))
+    return tail_lines(source, follow=follow, poll=poll)
+
+
+def parse_records(lines):
+    """
+    (horodatage, {colonne_kWh: valeur}) pour chaque ligne 15 min. La première ligne est
+    l'en-tête Swissgrid (résolu comme pour l'Excel) ; les lignes non numériques
+    (ligne des unités) sont ignorées.
+    """
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        return
+    sep = ';' if ';' in header else ','
+    columns = resolve_swissgrid_columns([h.strip().strip('"') for h in header.rstrip('\r\n').split(sep)])
+    for line in lines:
+        cells = line.rstrip('\r\n').split(sep)
+        try:
+            ts = datetime.strptime(cells[0].strip().strip('"'), '%d.%m.%Y %H:%M')
+            record = {name: float(cells[pos]) for name, pos in columns.items()}
+        except (ValueError, IndexError):
+            continue
+        yield ts, record
+
+
+class RingBuffer:
+    """
+    Moyenne glissante sur les `size` derniers pas, O(1) par pas : tampon circulaire +
+    sommes et comptes courants (NaN ignorés). Les sommes sont recalculées à chaque tour
+    complet pour éviter la dérive numérique.
+    """
+
+    def __init__(self, size, n_cols):
+        self.values = np.full((size, n_cols), np.nan)
+        self.sums = np.zeros(n_cols)
+        self.counts = np.zeros(n_cols, dtype='int64')
+        self.pos = 0
+        self.filled = 0
+
+    def push(self, row):
+        old = self.values[self.pos]
+        self.sums += np.nan_to_num(row) - np.nan_to_num(old)
+        self.counts += np.isnan(old).astype('int64') - np.isnan(row).astype('int64')
+        self.values[self.pos] = row
+        self.pos = (self.pos + 1) % len(self.values)
+        self.filled = min(self.filled + 1, len(self.values))
+        if self.pos == 0:
+            self.sums = np.nansum(self.values, axis=0)
+
+    def mean(self):
+        # NaN tant que la fenêtre n'est pas complète (comme les bords du lissage batch)
+        if self.filled < len(self.values):
+            return np.full(len(self.sums), np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts > 0, self.sums / self.counts, np.nan)
+
+
+class LiveAggregator:
+    """
+    Consommateur en flux des enregistrements 15 min : agrégats horaires (ou 15 min),
+    moyennes glissantes 7 jours, cumul financier, KPIs de déficit et flux frontaliers,
+    mis à jour en O(1) par enregistrement sans recalcul sur l'historique.
+
+    Les pas sont étiquetés comme dans l'agrégation batch (src.aggregation) : horodatages
+    ramenés en UTC par LocalClock, pas UTC contenant l'horodatage, étiquette en heure locale.
+    Un pas n'est publié qu'une fois son dernier instant UTC dépassé : l'heure longue
+    d'automne réunit ses deux passages (8 quarts d'heure) avant publication.
+
+    Le lissage est "glissant arrière" (moyenne des 7 derniers jours) : la valeur au pas t
+    correspond à la moyenne centrée batch au pas t - 3.5 jours.
+    """
+
+    def __init__(self, price_source=None, resolution='h', window=SMOOTHING_WINDOW, on_step=None,
+                 tz='Europe/Zurich'):
+        step = freq_to_timedelta(resolution)
+        self.step_ns = step.value
+        self.window_steps = int(pd.Timedelta(window) / step)
+        self.ring = RingBuffer(self.window_steps, len(ROLLING_COLUMNS))
+        self.on_step = on_step
+        if isinstance(price_source, PriceAligner) or price_source is None:
+            self.prices = price_source
+        else:
+            self.prices = PriceAligner(price_source)
+
+        # Pas ouverts (étiquette locale -> [sommes kWh, nb de quarts d'heure, 1er et dernier pas UTC])
+        self.clock = LocalClock(tz)
+        self._open = {}
+        self._published = None  # dernier pas UTC publié
+
+        # État cumulé
+        self.history = []
+        self.last = None
+        self.late_records = 0
+        self.revenue_cumul_eur = 0.0
+        self.max_deficit_mw = 0.0
+        self.import_hours = 0.0
+        self.import_mwh = 0.0
+        self.deficit_streak_hours = 0.0
+        self.longest_deficit_hours = 0.0
+
+    def push(self, timestamp, record):
+        """Ajoute un enregistrement 15 min (horodatage Swissgrid local naïf, valeurs en kWh)."""
+        bucket = self.clock.to_utc(timestamp) // self.step_ns * self.step_ns
+        if self._published is not None and bucket <= self._published:
+            self.late_records += 1  # retard : le pas est déjà publié
+            return
+
+        # Pas dont le dernier instant UTC est dépassé : publiés dans l'ordre
+        done = sorted(label for label, step in self._open.items() if step[3] < bucket)
+        for label in done:
+            self._publish(label)
+
+        label = self.clock.label(bucket)
+        step = self._open.get(label)
+        if step is None:
+            step = self._open[label] = [{}, 0, bucket, self.clock.last_bucket(label)]
+        sums = step[0]
+        for name, value in record.items():
+            sums[name] = sums.get(name, 0.0) + value
+        step[1] += 1
+
+    def flush(self):
+        """Publie les pas en cours (fin de flux), même incomplets."""
+        for label in sorted(self._open):
+            self._publish(label)
+
+    def _publish(self, label):
+        sums, count, first, last = self._open.pop(label)
+        if self._published is not None:
+            # Pas manquants dans le flux : trous explicites dans la fenêtre glissante
+            for _ in range(self._published + self.step_ns, first, self.step_ns):
+                self.ring.push(np.full(len(ROLLING_COLUMNS), np.nan))
+        self._published = last if self._published is None else max(self._published, last)
+        self._close(label, sums, count)
+
+    def consume(self, records):
+        for timestamp, record in records:
+            self.push(timestamp, record)
+        self.flush()
+        return self
+
+    def _close(self, label, sums, count):
+        # kWh cumulés sur `count` quarts d'heure -> puissance moyenne (MW)
+        mw = {name.replace('_kWh', '_MW'): total * 4 / count / 1000 for name, total in sums.items()}
+        row = {
+            'Timestamp': pd.Timestamp(label),
+            'Production_MW': mw['Production_MW'],
+            'Consumption_MW': mw['Consumption_MW'],
+            'Residual_Load_MW': mw['Consumption_MW'] - mw['Production_MW'],
+        }
+        for code in NEIGHBORS:
+            if f'Export_{code}_MW' in mw:
+                row[f'Net_Flow_{code}_MW'] = mw[f'Export_{code}_MW'] - mw[f'Import_{code}_MW']
+        row['Import_Total_MW'] = mw.get('Import_Total_MW', np.nan)
+        row['Export_Total_MW'] = mw.get('Export_Total_MW', np.nan)
+        row['Total_Flux_MW'] = row['Import_Total_MW'] + row['Export_Total_MW']
+        row['Transit_MW'] = mw.get('Transit_MW', 0.0)
+        row['Samples_15min'] = count
+
+        # Durée couverte par le pas (2 h pour l'heure longue d'automne), comme step_durations
+        hours = count * 0.25
+
+        # Finances (formule du Loader) : (Export - Import) x Prix x durée du pas
+        price = 0.0
+        if self.prices is not None:
+            price = float(self.prices.align(pd.DatetimeIndex([row['Timestamp']]), ['CH'])['Price_EUR'][0])
+        row['Price_EUR'] = price
+        row['Net_Revenue_EUR'] = np.nan_to_num((row['Export_Total_MW'] - row['Import_Total_MW']) * price * hours)
+        self.revenue_cumul_eur += row['Net_Revenue_EUR']
+        row['Revenue_Cumul_Million_EUR'] = self.revenue_cumul_eur / 1_000_000
+
+        # KPIs de déficit (mêmes définitions que src.kpi)
+        deficit = row['Residual_Load_MW']
+        if deficit > 0:
+            self.import_hours += hours
+            self.import_mwh += deficit * hours
+            self.max_deficit_mw = max(self.max_deficit_mw, deficit)
+            self.deficit_streak_hours += hours
+            self.longest_deficit_hours = max(self.longest_deficit_hours, self.deficit_streak_hours)
+        else:
+            self.deficit_streak_hours = 0.0
+
+        self.ring.push(np.array([row.get(c, np.nan) for c in ROLLING_COLUMNS], dtype='float64'))
+        self.history.append(row)
+        self.last = row
+        if self.on_step is not None:
+            self.on_step(self)
+
+    def rolling_means(self):
+        """Moyennes glissantes 7 jours courantes {colonne: MW} (NaN avant 7 jours de données)."""
+        return dict(zip(ROLLING_COLUMNS, self.ring.mean()))
+
+    def snapshot(self):
+        """État courant : dernier pas publié, lissages, KPIs de déficit et cumul financier."""
+        return {
+            'last': self.last,
+            'rolling': self.rolling_means(),
+            'Revenue_Cumul_Million_EUR': self.revenue_cumul_eur / 1_000_000,
+            'Max_Deficit_MW': self.max_deficit_mw,
+            'Import_Hours': self.import_hours,
+            'Import_GWh': self.import_mwh / 1000,
+            'Longest_Deficit_Hours': self.longest_deficit_hours,
+            'Late_Records': self.late_records,
+        }
+
+    def to_frame(self):
+        """Historique des pas publiés (même schéma que le DataFrame du Loader)."""
+        return pd.DataFrame(self.history).set_index('Timestamp')
@@ -1,12 +1,37 @@
 import pandas as pd
 import os
+import glob
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from src.cache import ParquetCache
+from src.aggregation import aggregate_power
+from src.excel_reader import read_swissgrid_streaming
+from src.headers import NEIGHBORS, SchemaError, resolve_swissgrid_columns
+from src.resolution import freq_to_timedelta, step_durations
+from src.schema import compact
+from src.prices import PriceAligner
+from src.profiling import profiled
+
+# À incrémenter à chaque changement du parsing : invalide le cache Parquet
+PARSER_VERSION = 3
 
 class SwissGridLoader:
-    def __init__(self, filepath_swissgrid, filepath_prices):
+    def __init__(self, filepath_swissgrid, filepath_prices, use_cache=True, cache_dir=None, engine='streaming',
+                 resolution='h', compact=False):
         self.filepath_swissgrid = filepath_swissgrid
         self.filepath_prices = filepath_prices
+        # Résolution de sortie : 'h' (puissance moyenne horaire) ou '15min' (résolution native)
+        self.resolution = resolution
+        # Stockage compact (float32, cf. schema.py) pour les gros volumes / copies de scénarios
+        self.compact = compact
+        # 'streaming' : openpyxl read-only, colonnes utiles seulement | 'pandas' : read_excel complet
+        self.engine = engine
+        # Cache Parquet à côté de la source (data/.cache/) sauf indication contraire
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(filepath_swissgrid), '.cache')
+        self.cache = ParquetCache(cache_dir) if use_cache else None
 
+    @profiled('loader.load_data')
     def load_data(self):
         print(f"\n--- 1. CHARGEMENT SWISSGRID (Physique) ---")
         df = self._load_swissgrid_physical()
@@ -16,148 +41,305 @@ class SwissGridLoader:
         df = self._merge_spot_prices(df)
         
         print(f"\n--- 3. CALCULS FINANCIERS ---")
+        df = self._compute_financials(df)
+
+        df = df.dropna(subset=['Production_MW'])
+        if self.compact:
+            df = compact(df)
+
+        # On garde le résultat pour une éventuelle ré-ingestion incrémentale (update)
+        self.df = df
+        return self.df
+
+    @profiled('loader.update')
+    def update(self, df_prev=None):
+        """
+        Ingestion incrémentale (année en cours re-téléchargée chaque semaine).
+        On repart du dernier pas complet de `df_prev` (par défaut le dernier résultat de load_data),
+        on ne lit/agrège que les lignes suivantes du classeur, et le cumul financier est
+        prolongé depuis sa dernière valeur au lieu d'être recalculé sur toute l'année.
+        Valable pour les deux moteurs de lecture ; avec MultiYearLoader, seul le dernier
+        classeur est relu.
+        """
+        df_prev = getattr(self, 'df', None) if df_prev is None else df_prev
+        if df_prev is None or df_prev.empty:
+            return self.load_data()
+
+        # Dernier pas complet : la fin de l'heure (ou du quart d'heure) en cours sera relue
+        expected = freq_to_timedelta(self.resolution) // pd.Timedelta('15min')
+        complete = df_prev.index[df_prev['Samples_15min'] >= expected]
+        if complete.empty:
+            return self.load_data()
+        cutoff = complete[-1]
+        df_kept = df_prev.loc[:cutoff]
+
+        print(f"\n--- INGESTION INCRÉMENTALE (après {cutoff}) ---")
+        min_row = self._resume_row(df_kept)
+        df_15 = self._parse_swissgrid_excel(min_row=min_row)
+        if df_15 is None: return None
+
+        df_15 = df_15[df_15.index.floor(self.resolution) > cutoff]
+        if df_15.empty:
+            print("Aucune nouvelle donnée.")
+            return df_prev
+        print(f"   -> {len(df_15)} nouveaux quarts d'heure")
+
+        df_new = self._build_power_frame(df_15)
+        df_new = self._merge_spot_prices(df_new)
+
+        cumul_start = 0.0
+        if 'Revenue_Cumul_Million_EUR' in df_kept.columns and len(df_kept):
+            cumul_start = df_kept['Revenue_Cumul_Million_EUR'].iloc[-1]
+        df_new = self._compute_financials(df_new, cumul_start=cumul_start)
+
+        df_new = df_new.dropna(subset=['Production_MW'])
+        if self.compact:
+            df_new = compact(df_new)
+        self.df = pd.concat([df_kept, df_new])
+        return self.df
+
+    def _resume_row(self, df_kept):
+        """Ligne de la feuille (1-indexée) à partir de laquelle relire pour prolonger `df_kept`."""
+        # Les quarts d'heure déjà intégrés précèdent forcément les nouveaux dans la feuille
+        # (relire quelques lignes de trop est sans effet : elles sont filtrées après lecture)
+        return int(df_kept['Samples_15min'].sum()) + 1
+
+    @profiled('loader.financials')
+    def _compute_financials(self, df, cumul_start=0.0):
         # On vérifie qu'on a bien des prix
         if df['Price_EUR'].sum() == 0:
             print("🛑 STOP : La colonne Prix est vide ou à 0. Le graphe sera vide.")
             # On continue quand même pour afficher les autres graphes
         else:
-            # Formule
-            df['Net_Revenue_EUR'] = (df['Export_Total_MW'] - df['Import_Total_MW']) * df['Price_EUR']
-            df['Revenue_Cumul_Million_EUR'] = df['Net_Revenue_EUR'].cumsum() / 1_000_000
+            # Formule (MW x €/MWh x durée du pas en heures, cf. Samples_15min)
+            hours = step_durations(df, self.resolution)
+            df['Net_Revenue_EUR'] = (df['Export_Total_MW'] - df['Import_Total_MW']) * df['Price_EUR'] * hours
+            df['Revenue_Cumul_Million_EUR'] = cumul_start + df['Net_Revenue_EUR'].cumsum() / 1_000_000
             
             last_val = df['Revenue_Cumul_Million_EUR'].iloc[-1]
             print(f"✅ CALCUL RÉUSSI. Bilan final : {last_val:.2f} Millions €")
-        
-        return df.dropna(subset=['Production_MW'])
+        return df
 
     def _load_swissgrid_physical(self):
-        print(f"Lecture Swissgrid : {self.filepath_swissgrid}")
-        if not os.path.exists(self.filepath_swissgrid):
-            raise FileNotFoundError(f"❌ Fichier Swissgrid introuvable : {self.filepath_swissgrid}")
-
-        try:
-            # Lecture
-            df_raw = pd.read_excel(self.filepath_swissgrid, sheet_name='Zeitreihen0h15', header=0)
-        except Exception as e:
-            print(f"⚠️ Erreur lecture Excel : {e}")
-            return None
-
-        # Suppression ligne des unités (kWh) si présente
-        if isinstance(df_raw.iloc[0, 2], str):
-            df_raw = df_raw.drop(index=0)
+        df = self._read_swissgrid_15min()
+        if df is None: return None
+        return self._build_power_frame(df)
 
-        # Index Temporel
-        df_raw.index = pd.to_datetime(df_raw.iloc[:, 0], dayfirst=True, errors='coerce')
-        df_raw = df_raw[df_raw.index.notna()]
-        # Gestion DST (Doublons changement d'heure)
-        df_raw = df_raw[~df_raw.index.duplicated(keep='first')]
+    @profiled('loader.aggregation')
+    def _build_power_frame(self, df):
+        print(f"Conversion kWh 15min -> MW (pas '{self.resolution}')...")
+        # Une seule réduction pour tous les canaux (cf. aggregation.py pour la gestion DST)
+        index, mw, counts, expected = aggregate_power(df.index, df.to_numpy(), freq=self.resolution)
+        hourly = dict(zip((c.replace('_kWh', '_MW') for c in df.columns), mw.T))
 
-        # Conversion numérique globale
-        df = df_raw.apply(pd.to_numeric, errors='coerce')
-
-        print("Conversion kWh 15min -> MW Horaire...")
-        
-        # On prépare un nouveau DataFrame horaire pour éviter les problèmes d'index
-        df_hourly = pd.DataFrame(index=df.resample('h').first().index)
+        df_hourly = pd.DataFrame(index=index)
+        df_hourly.index.name = 'Timestamp'
 
         # --- A. Prod & Conso ---
-        # Somme des 4 quarts d'heure / 1000
-        df_hourly['Production_MW'] = df.iloc[:, 2].resample('h').sum() / 1000
-        df_hourly['Consumption_MW'] = df.iloc[:, 3].resample('h').sum() / 1000
+        df_hourly['Production_MW'] = hourly['Production_MW']
+        df_hourly['Consumption_MW'] = hourly['Consumption_MW']
         
         # Gap (Charge Résiduelle)
         df_hourly['Residual_Load_MW'] = df_hourly['Consumption_MW'] - df_hourly['Production_MW']
 
         # --- B. Flux Frontières (Net Flow) ---
-        neighbors = {'DE': 'DE', 'FR': 'FR', 'IT': 'IT', 'AT': 'AT'}
-        for code in neighbors:
-            col_e = next((c for c in df.columns if f"CH->{code}" in str(c)), None)
-            col_i = next((c for c in df.columns if f"{code}->CH" in str(c)), None)
-            if col_e and col_i:
+        for code in NEIGHBORS:
+            if f'Export_{code}_MW' in hourly:
                 # Net = Export - Import
-                net_flow = (df[col_e] - df[col_i]).resample('h').sum() / 1000
-                df_hourly[f'Net_Flow_{code}_MW'] = net_flow
+                df_hourly[f'Net_Flow_{code}_MW'] = hourly[f'Export_{code}_MW'] - hourly[f'Import_{code}_MW']
 
         # --- C. Flux Totaux ---
-        col_imp = next((c for c in df.columns if "Import" in str(c).strip()), None)
-        col_exp = next((c for c in df.columns if "Export" in str(c).strip()), None)
-        
-        if col_imp and col_exp:
-            df_hourly['Import_Total_MW'] = df[col_imp].resample('h').sum() / 1000
-            df_hourly['Export_Total_MW'] = df[col_exp].resample('h').sum() / 1000
-            df_hourly['Total_Flux_MW'] = df_hourly['Import_Total_MW'] + df_hourly['Export_Total_MW']
-        else:
-            print("⚠️ Colonnes Import/Export introuvables !")
-            return None
+        df_hourly['Import_Total_MW'] = hourly['Import_Total_MW']
+        df_hourly['Export_Total_MW'] = hourly['Export_Total_MW']
+        df_hourly['Total_Flux_MW'] = df_hourly['Import_Total_MW'] + df_hourly['Export_Total_MW']
 
         # --- D. Transit ---
-        col_transit = next((c for c in df.columns if "Transit" in str(c)), None)
-        if col_transit:
-            df_hourly['Transit_MW'] = df[col_transit].resample('h').sum() / 1000
-        else:
-            df_hourly['Transit_MW'] = 0
+        df_hourly['Transit_MW'] = hourly['Transit_MW']
+
+        # Nombre de quarts d'heure par pas (4 par heure normalement, 8 pour l'heure longue d'automne)
+        df_hourly['Samples_15min'] = counts
+        # Écart à l'attendu dans les deux sens : pas incomplet, ou lignes en trop (doublons non identiques)
+        irregular = int((counts != expected).sum())
+        if irregular:
+            print(f"⚠️ {irregular} pas irrégulier(s) (nombre de quarts d'heure ≠ attendu), "
+                  f"cf. colonne 'Samples_15min'")
 
         return df_hourly.dropna(subset=['Production_MW'])
 
-    def _merge_spot_prices(self, df_phys):
-        print(f"--> Lecture Prix Spot : {self.filepath_prices}")
-        
-        if not os.path.exists(self.filepath_prices):
-            print("⚠️ Fichier Prix introuvable. Prix mis à 0.")
-            df_phys['Price_EUR'] = 0
-            return df_phys
+    @profiled('loader.read_15min')
+    def _read_swissgrid_15min(self):
+        """
+        Lecture du classeur Swissgrid -> DataFrame 15 min typé (kWh), dédoublonné (DST).
+        Passe par le cache Parquet si disponible.
+        """
+        print(f"Lecture Swissgrid : {self.filepath_swissgrid}")
+        if not os.path.exists(self.filepath_swissgrid):
+            raise FileNotFoundError(f"❌ Fichier Swissgrid introuvable : {self.filepath_swissgrid}")
+
+        # Le moteur fait partie de la clé : les deux ne produisent pas les mêmes dtypes
+        version = f"{PARSER_VERSION}-{self.engine}"
+        if self.cache is not None:
+            df = self.cache.load(self.filepath_swissgrid, version)
+            if df is not None:
+                print(f"   -> Cache Parquet utilisé ({len(df)} quarts d'heure)")
+                return df
+
+        df = self._parse_swissgrid_excel()
+        if df is not None and self.cache is not None:
+            self.cache.store(self.filepath_swissgrid, version, df)
+        return df
 
+    @profiled('loader.excel_parse')
+    def _parse_swissgrid_excel(self, min_row=2):
         try:
-            # 1. TENTATIVE INTELLIGENTE
-            try:
-                df_price = pd.read_excel(self.filepath_prices)
-            except:
-                df_price = pd.read_csv(self.filepath_prices, sep=None, engine='python')
-
-            # 2. COLONNE UNIQUE (format : YYYY-MM-DD,Price) -> NETTOYAGE DES DONNÉES
-            col_name = df_price.columns[0]
-            df_price = df_price.iloc[:, 0].astype(str).str.replace('"', '').str.split(',', expand=True)
-            df_price.columns = ['Datum', 'Price']
-            
-            # Nettoyage des noms de colonnes
-            df_price.columns = [c.strip().replace('"', '').replace("'", "") for c in df_price.columns]
+            if self.engine == 'streaming':
+                timestamps, values, names = read_swissgrid_streaming(self.filepath_swissgrid, min_row=min_row)
+                index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'))
+                df_15 = pd.DataFrame(values, index=index, columns=names)
+            else:
+                df_15 = self._parse_excel_pandas(min_row=min_row)
+        except SchemaError:
+            # En-têtes non reconnus : on s'arrête net (message explicite) plutôt que de renvoyer None
+            raise
+        except Exception as e:
+            print(f"⚠️ Erreur lecture Excel : {e}")
+            return None
 
-            # 3. IDENTIFICATION COLONNES
-            col_price = next((c for c in df_price.columns if 'Baseload' in c or 'Price' in c or 'EUR' in c), None)
-            col_date = next((c for c in df_price.columns if 'Datum' in c or 'Date' in c), None)
+        if 'Transit_kWh' not in df_15.columns:
+            df_15['Transit_kWh'] = 0.0
 
-            # 4. CONVERSION
-            df_price['Datum'] = pd.to_datetime(df_price[col_date], errors='coerce')
-            df_price['Price_EUR'] = pd.to_numeric(df_price[col_price], errors='coerce')
-            df_price = df_price.dropna(subset=['Datum', 'Price_EUR'])
+        df_15.index.name = 'Timestamp'
+        # Les doublons DST (heure longue d'automne) sont conservés : cf. aggregation.to_utc
+        return df_15[df_15.index.notna()]
 
-            # --- ON GARDE QUE 2025 ---
-            year_phys = df_phys.index.year[0] # L'année cible (2025)
-            df_target = df_price[df_price['Datum'].dt.year == year_phys].copy()
+    def _parse_excel_pandas(self, min_row=2):
+        # Lecture de la feuille (moteur historique) ; `min_row` : on saute les lignes déjà intégrées
+        skiprows = range(1, min_row - 1) if min_row > 2 else None
+        df_raw = pd.read_excel(self.filepath_swissgrid, sheet_name='Zeitreihen0h15', header=0, skiprows=skiprows)
+        columns = resolve_swissgrid_columns(df_raw.columns)
 
-            # 5. FUSION (MERGE)
-            df_phys['Join_Date'] = df_phys.index.normalize()
-            df_price['Join_Date'] = df_price['Datum'].dt.normalize()
-            
-            # On ne garde que les colonnes utiles et on vire les doublons créés par le forcage
-            df_clean_price = df_price[['Join_Date', 'Price_EUR']].drop_duplicates(subset=['Join_Date'])
-            
-            print(f"   -> {len(df_clean_price)} prix journaliers prêts à être fusionnés.")
+        # Suppression ligne des unités (kWh) si présente
+        if len(df_raw) and isinstance(df_raw.iloc[0, 2], str):
+            df_raw = df_raw.drop(index=0)
 
-            # Merge
-            df_merged = df_phys.merge(df_clean_price, on='Join_Date', how='left')
-            
-            # Nettoyage final
-            df_merged.index = df_phys.index
-            
-            # Remplissage des trous
-            df_merged['Price_EUR'] = df_merged['Price_EUR'].fillna(method='ffill').fillna(method='bfill').fillna(0)
-            
-            return df_merged.drop(columns=['Join_Date'])
+        # Index Temporel
+        index = pd.to_datetime(df_raw.iloc[:, 0], dayfirst=True, errors='coerce')
+
+        # Conversion numérique des seules colonnes utiles, sous des noms canoniques
+        df_15 = df_raw.iloc[:, list(columns.values())].apply(pd.to_numeric, errors='coerce')
+        df_15.columns = list(columns)
+        df_15.index = pd.DatetimeIndex(index)
+        return df_15.astype('float64')
+
+    @profiled('loader.price_merge')
+    def _merge_spot_prices(self, df_phys):
+        print(f"--> Lecture Prix Spot : {self.filepath_prices}")
+        
+        sources = self.filepath_prices if isinstance(self.filepath_prices, dict) else {None: self.filepath_prices}
+        missing = [f for f in sources.values() if not os.path.exists(f)]
+        if missing:
+            print(f"⚠️ Fichier Prix introuvable ({missing[0]}). Prix mis à 0.")
+            return df_phys.assign(Price_EUR=0.0)
+
+        try:
+            # Jointure as-of sur index trié : prix journaliers, horaires ou 15 min, une ou plusieurs zones
+            aligner = PriceAligner(self.filepath_prices)
+            aligner.describe()
+            return aligner.merge(df_phys)
 
         except Exception as e:
             print(f"❌ CRASH LECTURE PRIX : {e}")
             import traceback
             traceback.print_exc()
-            df_phys['Price_EUR'] = 0
-            return df_phys
\ No newline at end of file
+            return df_phys.assign(Price_EUR=0.0)
+
+
+def _read_15min_worker(args):
+    """Lecture d'un classeur annuel (exécutée dans un processus du pool)."""
+    filepath, use_cache, engine = args
+    loader = SwissGridLoader(filepath, None, use_cache=use_cache, engine=engine)
+    return filepath, loader._read_swissgrid_15min()
+
+
+class MultiYearLoader(SwissGridLoader):
+    """
+    Chargement multi-annuel : un dossier ou un glob de classeurs Swissgrid (un par année).
+    Les classeurs sont parsés en parallèle (pool de processus, openpyxl tient le GIL),
+    puis recollés au pas 15 min avant l'agrégation horaire unique.
+    """
+
+    def __init__(self, source_swissgrid, filepath_prices, workers=None, use_cache=True, engine='streaming',
+                 resolution='h', compact=False):
+        self.filepaths = self._resolve_files(source_swissgrid)
+        # Pas de cache au niveau multi-annuel : chaque worker construit son propre loader
+        # (et son cache à côté de son classeur) selon self.use_cache
+        super().__init__(', '.join(self.filepaths), filepath_prices, use_cache=False, engine=engine,
+                         resolution=resolution, compact=compact)
+        self.source_swissgrid = source_swissgrid
+        self.workers = workers or os.cpu_count()
+        self.use_cache = use_cache
+
+    @staticmethod
+    def _resolve_files(source):
+        if isinstance(source, (list, tuple)):
+            files = list(source)
+        elif os.path.isdir(source):
+            files = glob.glob(os.path.join(source, '*.xlsx'))
+        else:
+            files = glob.glob(source)
+        # On ignore les fichiers de verrou Excel (~$...)
+        files = sorted(f for f in files if not os.path.basename(f).startswith('~$'))
+        if not files:
+            raise FileNotFoundError(f"❌ Aucun classeur Swissgrid trouvé : {source}")
+        return files
+
+    @profiled('loader.read_15min')
+    def _read_swissgrid_15min(self):
+        print(f"Lecture de {len(self.filepaths)} classeurs Swissgrid ({self.workers} processus)...")
+        jobs = [(f, self.use_cache, self.engine) for f in self.filepaths]
+
+        if self.workers == 1 or len(jobs) == 1:
+            results = [_read_15min_worker(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                results = list(pool.map(_read_15min_worker, jobs))
+
+        frames = []
+        last_ts = None
+        self._last_file_start = None
+        for filepath, df in results:
+            if df is None:
+                print(f"⚠️ Classeur ignoré (lecture impossible) : {filepath}")
+                continue
+            # Recouvrement entre fichiers : on ne garde que ce qui suit le fichier précédent
+            # (pas de tri/dédoublonnage global, qui casserait l'ordre des doublons DST)
+            if last_ts is not None:
+                df = df[df.index > last_ts]
+            if len(df):
+                frames.append(df)
+                last_ts = df.index.max()
+                if filepath == self.filepaths[-1]:
+                    self._last_file_start = df.index[0]
+        if not frames:
+            return None
+
+        # Recollage au pas 15 min : l'heure 00:00 du 1er janvier est partagée entre deux fichiers
+        return pd.concat(frames)
+
+    def _resume_row(self, df_kept):
+        """
+        Ligne de reprise dans le dernier classeur : seuls comptent les quarts d'heure qui
+        en proviennent (pas postérieurs à son premier horodatage). Sans load_data préalable,
+        le dernier classeur est relu en entier.
+        """
+        start = getattr(self, '_last_file_start', None)
+        if start is None:
+            return 2
+        after = df_kept.index > start.floor(self.resolution)
+        return int(df_kept.loc[after, 'Samples_15min'].sum()) + 1
+
+    def _parse_swissgrid_excel(self, min_row=2):
+        """Ingestion incrémentale (update) : seul le dernier classeur (année en cours) évolue."""
+        loader = SwissGridLoader(self.filepaths[-1], None, use_cache=False, engine=self.engine,
+                                 resolution=self.resolution)
+        return loader._parse_swissgrid_excel(min_row=min_row)
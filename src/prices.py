@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+from src.headers import resolve_price_columns
+
+# Zones de prix supportées (CH = prix suisse, colonne historique 'Price_EUR')
+AREAS = ['CH', 'DE', 'FR', 'IT', 'AT']
+
+
+def price_column(area):
+    """Nom de la colonne de prix d'une zone dans le DataFrame d'analyse."""
+    return 'Price_EUR' if area == 'CH' else f'Price_{area}_EUR'
+
+
+def read_price_table(filepath):
+    """
+    Lecture d'un fichier de prix (Excel ou CSV, éventuellement "CSV dans une seule colonne").
+    Renvoie {zone: Series triée indexée par l'horodatage du début de validité}.
+    """
+    # 1. TENTATIVE INTELLIGENTE
+    try:
+        df_price = pd.read_excel(filepath)
+    except Exception:
+        df_price = pd.read_csv(filepath, sep=None, engine='python')
+
+    # 2. COLONNE UNIQUE (format : YYYY-MM-DD,Price) -> découpage
+    if len(df_price.columns) == 1 and ',' in str(df_price.columns[0]):
+        header = [c.strip().replace('"', '').replace("'", "") for c in str(df_price.columns[0]).split(',')]
+        df_price = df_price.iloc[:, 0].astype(str).str.replace('"', '').str.split(',', expand=True)
+        df_price.columns = header
+    df_price.columns = [str(c).strip().replace('"', '').replace("'", "") for c in df_price.columns]
+
+    # 3. IDENTIFICATION COLONNES (résolue une fois par schéma de fichier, cf. headers.py)
+    col_date, price_cols = resolve_price_columns(df_price.columns, AREAS)
+    timestamps = pd.to_datetime(df_price[col_date], errors='coerce')
+
+    series = {}
+    for area, col in price_cols.items():
+        s = pd.Series(pd.to_numeric(df_price[col], errors='coerce').to_numpy(), index=timestamps)
+        s = s[s.index.notna() & s.notna()]
+        series[area] = s[~s.index.duplicated(keep='first')].sort_index()
+    return series
+
+
+class PriceAligner:
+    """
+    Alignement des prix spot sur l'index temporel du DataFrame physique, par jointure
+    "as-of" sur index trié : à chaque pas on prend le dernier prix publié (début de validité <= t).
+    Fonctionne pour des prix journaliers, horaires ou 15 min, et pour plusieurs zones à la fois.
+    `sources` : chemin d'un fichier (une ou plusieurs zones) ou dict {zone: chemin}.
+    """
+
+    def __init__(self, sources):
+        self.series = {}
+        items = sources.items() if isinstance(sources, dict) else [(None, sources)]
+        for area, filepath in items:
+            table = read_price_table(filepath)
+            if area is not None:
+                # Fichier dédié à une zone : on prend sa première colonne de prix
+                table = {area: next(iter(table.values()))} if table else {}
+            self.series.update(table)
+
+    def describe(self):
+        for area, s in self.series.items():
+            step = pd.Series(s.index).diff().median() if len(s) > 1 else pd.NaT
+            print(f"   -> {area} : {len(s)} prix (pas {step}), {s.index.min():%Y-%m-%d} -> {s.index.max():%Y-%m-%d}")
+
+    def align(self, index, areas=None):
+        """Renvoie {colonne: valeurs alignées sur `index`} (sans copier le DataFrame cible)."""
+        t = np.asarray(pd.DatetimeIndex(index).as_unit('ns').asi8)
+        searched = []  # [(index des prix, positions)]
+        aligned = {}
+        # Le prix suisse est toujours produit (à 0 s'il manque), puis les zones voisines
+        areas = areas or ['CH'] + [a for a in self.series if a != 'CH']
+        for area in areas:
+            s = self.series.get(area)
+            if s is None or s.empty:
+                aligned[price_column(area)] = np.zeros(len(t))
+                continue
+            # Les zones qui partagent le même axe temporel ne sont recherchées qu'une fois
+            pos = next((p for idx, p in searched if idx.equals(s.index)), None)
+            if pos is None:
+                ts = s.index.as_unit('ns').asi8
+                # Avant le premier prix : on prend le premier (équivalent du bfill historique)
+                pos = np.clip(np.searchsorted(ts, t, side='right') - 1, 0, None)
+                searched.append((s.index, pos))
+            aligned[price_column(area)] = s.to_numpy(dtype='float64')[pos]
+        return aligned
+
+    def merge(self, df, areas=None):
+        return df.assign(**self.align(df.index, areas))
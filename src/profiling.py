@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource  # Unix uniquement (pic RSS)
+except ImportError:
+    resource = None
+
+# Instrumentation désactivée par défaut : stage() ne coûte alors qu'un appel de fonction
+# - memory : delta de pic tracemalloc par étape (ralentit sensiblement les allocations)
+# - cprofile_dir : un fichier .prof par étape de premier niveau (lecture : snakeviz, pstats)
+_CONFIG = {'enabled': False, 'memory': False, 'cprofile_dir': None}
+_RECORDS = []
+_STACK = []
+
+
+def configure(enabled=True, memory=False, cprofile_dir=None):
+    _CONFIG.update(enabled=enabled, memory=memory, cprofile_dir=cprofile_dir)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if cprofile_dir:
+        os.makedirs(cprofile_dir, exist_ok=True)
+
+
+def get_config():
+    return dict(_CONFIG)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Ko sous Linux
+
+
+@contextmanager
+def stage(name, rows=None):
+    """
+    Mesure une étape : temps réel, temps CPU, pic RSS, delta de pic tracemalloc (si memory)
+    et nombre de lignes (`rows`, ou record['rows'] renseigné dans le bloc).
+    Les étapes peuvent être imbriquées (profondeur conservée dans le rapport).
+    """
+    if not _CONFIG['enabled']:
+        yield {}
+        return
+
+    record = {'stage': name, 'depth': len(_STACK), 'rows': rows}
+    profiler = None
+    if _CONFIG['cprofile_dir'] and not _STACK:
+        import cProfile
+        profiler = cProfile.Profile()
+    if _CONFIG['memory']:
+        if _STACK:
+            # Le pic atteint jusqu'ici appartient à l'étape englobante
+            _STACK[-1]['_peak'] = max(_STACK[-1]['_peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        record['_start_mem'] = record['_peak'] = tracemalloc.get_traced_memory()[0]
+
+    position = len(_RECORDS)
+    _STACK.append(record)
+    _RECORDS.append(record)  # ajouté à l'entrée : le rapport suit l'ordre de démarrage
+    wall, cpu, rss = time.perf_counter(), time.process_time(), _peak_rss_mb()
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(_CONFIG['cprofile_dir'], f"{position:03d}_{name}_{os.getpid()}.prof"))
+        record['wall_s'] = round(time.perf_counter() - wall, 4)
+        record['cpu_s'] = round(time.process_time() - cpu, 4)
+        rss_end = _peak_rss_mb()
+        record['peak_rss_mb'] = round(rss_end, 1) if rss_end is not None else None
+        record['rss_growth_mb'] = round(rss_end - rss, 1) if rss_end is not None else None
+        _STACK.pop()
+        if _CONFIG['memory']:
+            peak = max(record.pop('_peak'), tracemalloc.get_traced_memory()[1])
+            record['alloc_peak_mb'] = round((peak - record.pop('_start_mem')) / 2**20, 2)
+            if _STACK:
+                _STACK[-1]['_peak'] = max(_STACK[-1]['_peak'], peak)
+            tracemalloc.reset_peak()
+
+
+def profiled(name=None):
+    """
+    Décorateur : exécute la fonction dans stage(). Nom par défaut : Classe.méthode.
+    Lignes : len() du résultat s'il en a une, sinon celle de self.df pour une méthode d'analyseur.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _CONFIG['enabled']:
+                return func(*args, **kwargs)
+            with stage(label) as record:
+                result = func(*args, **kwargs)
+                if hasattr(result, '__len__') and not isinstance(result, (str, dict)):
+                    record['rows'] = len(result)
+                elif args and getattr(args[0], 'df', None) is not None:
+                    record['rows'] = len(args[0].df)
+            return result
+        return wrapper
+    return decorator
+
+
+def records():
+    return list(_RECORDS)
+
+
+def extend(new_records):
+    """Ajoute des mesures faites ailleurs (ex. processus de rendu)."""
+    _RECORDS.extend(new_records)
+
+
+def pop_records():
+    taken = list(_RECORDS)
+    _RECORDS.clear()
+    return taken
+
+
+def report(path=None):
+    """Tableau récapitulatif en console, et rapport JSON si `path`."""
+    if not _RECORDS:
+        return []
+    print(f"\n--- PROFIL PAR ÉTAPE ---")
+    print(f"{'Étape':<48} {'Réel (s)':>9} {'CPU (s)':>9} {'Lignes':>9} {'Alloc (Mo)':>11}")
+    for r in _RECORDS:
+        label = '  ' * r['depth'] + r['stage']
+        rows = '' if r['rows'] is None else r['rows']
+        alloc = r.get('alloc_peak_mb', '')
+        print(f"{label:<48} {r['wall_s']:>9.3f} {r['cpu_s']:>9.3f} {rows:>9} {alloc:>11}")
+    if path:
+        with open(path, 'w') as f:
+            json.dump(_RECORDS, f, indent=2)
+        print(f"✅ Rapport de profil écrit : {path}")
+    return records()
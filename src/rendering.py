@@ -0,0 +1,97 @@
+import os
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from src import profiling
+
+# Configuration du rendu : output_dir=None -> plt.show() (interactif), sinon écriture fichier
+_CONFIG = {'output_dir': None, 'fmt': 'png', 'dpi': 150}
+
+# Catalogue des graphes : nom du fichier -> (module, classe, méthode)
+PLOTS = {
+    'WinterGap_Brut': ('src.visualizer', 'SwissGridVisualizer', 'plot_raw_data'),
+    'WinterGap_MA7': ('src.visualizer', 'SwissGridVisualizer', 'plot_smoothed_trend'),
+    'FluxTransfrontaliers': ('src.border_analyzer', 'BorderAnalyzer', 'plot_cross_border_flows'),
+    'FluxTotal_Brut': ('src.transit_analyzer', 'TransitAnalyzer', 'plot_total_activity_raw'),
+    'FluxTotal_MA7': ('src.transit_analyzer', 'TransitAnalyzer', 'plot_total_activity_smoothed'),
+    'Transit_MA7': ('src.transit_analyzer', 'TransitAnalyzer', 'plot_pure_transit'),
+    'AnalyseFinancière': ('src.cost_analyzer', 'CostAnalyzer', 'plot_financial_balance'),
+    'ValorisationFrontières': ('src.cost_analyzer', 'CostAnalyzer', 'plot_border_valuation'),
+    'ResidualLoad_DurationCurve': ('src.advanced_stats', 'AdvancedAnalyzer', 'plot_duration_curve'),
+    'TimeSignature': ('src.advanced_stats', 'AdvancedAnalyzer', 'plot_seasonal_heatmap'),
+    'ScatterPlot': ('src.advanced_stats', 'AdvancedAnalyzer', 'plot_price_correlation'),
+    'HydroDispatch': ('src.hydro_dispatch', 'HydroDispatchOptimizer', 'plot_dispatch'),
+}
+# Figures sur demande seulement (nommées explicitement) : le dispatch hydro résout un programme
+# linéaire sur toute la période avec des paramètres de réservoir par défaut
+OPT_IN_PLOTS = ('HydroDispatch',)
+DEFAULT_PLOTS = [name for name in PLOTS if name not in OPT_IN_PLOTS]
+
+
+def configure_headless(output_dir, fmt='png', dpi=150):
+    """Mode sans affichage : backend Agg, chaque graphe est écrit dans output_dir (png/pdf/svg)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    os.makedirs(output_dir, exist_ok=True)
+    _CONFIG.update(output_dir=output_dir, fmt=fmt, dpi=dpi)
+
+
+def finish(name):
+    """Fin de tracé commune à tous les analyseurs : affichage ou sauvegarde selon le mode."""
+    import matplotlib.pyplot as plt
+    if _CONFIG['output_dir'] is None:
+        plt.show()
+        return None
+
+    path = os.path.join(_CONFIG['output_dir'], f"{name}.{_CONFIG['fmt']}")
+    plt.savefig(path, dpi=_CONFIG['dpi'])
+    plt.close('all')
+    print(f"   -> Figure écrite : {path}")
+    return path
+
+
+def render(df, name):
+    """Trace un graphe du catalogue (import du module d'analyse à la demande)."""
+    module, cls, method = PLOTS[name]
+    analyzer = getattr(importlib.import_module(module), cls)(df)
+    getattr(analyzer, method)()
+    if _CONFIG['output_dir'] is None:
+        return None
+    return os.path.join(_CONFIG['output_dir'], f"{name}.{_CONFIG['fmt']}")
+
+
+_WORKER_DF = None
+
+
+def _init_worker(df, output_dir, fmt, dpi, profiling_config):
+    # Le DataFrame n'est transmis qu'une fois par processus
+    global _WORKER_DF
+    _WORKER_DF = df
+    configure_headless(output_dir, fmt, dpi)
+    profiling.pop_records()  # mesures héritées du parent (fork) : déjà comptées
+    profiling.configure(**profiling_config)
+
+
+def _render_worker(name):
+    # Les mesures du processus sont renvoyées avec le chemin (cf. profiling.extend)
+    return render(_WORKER_DF, name), profiling.pop_records()
+
+
+def render_all(df, output_dir, fmt='png', names=None, workers=None, dpi=150):
+    """
+    Rendu headless du catalogue par défaut (ou des figures `names`), les figures indépendantes
+    étant réparties sur un pool de processus. Renvoie la liste des fichiers écrits.
+    """
+    names = list(names or DEFAULT_PLOTS)
+    workers = min(workers or os.cpu_count(), len(names))
+    print(f"\n--- RENDU HEADLESS : {len(names)} figures -> {output_dir} ({workers} processus) ---")
+
+    if workers <= 1:
+        configure_headless(output_dir, fmt, dpi)
+        return [render(df, name) for name in names]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(df, output_dir, fmt, dpi, profiling.get_config())) as pool:
+        results = list(pool.map(_render_worker, names))
+    for _, records in results:
+        profiling.extend(records)
+    return [path for path, _ in results]
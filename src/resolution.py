@@ -0,0 +1,66 @@
+import pandas as pd
+import numpy as np
+from pandas.tseries.frequencies import to_offset
+
+# Lissage "stratégique" : 7 jours, quelle que soit la résolution des données
+SMOOTHING_WINDOW = '7D'
+
+
+def freq_to_timedelta(freq):
+    """'h' -> 1h, '15min' -> 15min (les alias pandas sans nombre ne passent pas par pd.Timedelta)."""
+    return pd.Timedelta(to_offset(freq))
+
+
+def resolution_step(df, resolution=None):
+    """Pas de temps des données (Timedelta) : explicite ('h', '15min') ou déduit de l'index."""
+    if resolution is not None:
+        return freq_to_timedelta(resolution)
+    if len(df.index) < 2:
+        return freq_to_timedelta('h')
+    return pd.Series(df.index).diff().median()
+
+
+def interval_start(df, resolution=None):
+    """
+    Instant de rattachement de chaque pas à une année / un mois (KPIs annuels, partitions).
+    Les horodatages Swissgrid sont des fins de quart d'heure regroupées par pas contenant
+    l'horodatage : le pas L couvre [L - 15 min, L + pas - 15 min) et seul le quart d'heure
+    terminé à L appartient à la période précédente. Un pas réduit à ce seul quart d'heure
+    (pas '15min', ou dernier pas "00:00" d'un classeur annuel) est donc rattaché à L - 15 min,
+    les autres à L.
+    """
+    index = pd.DatetimeIndex(df.index)
+    if 'Samples_15min' in df.columns:
+        single = df['Samples_15min'].to_numpy() <= 1
+    else:
+        single = np.full(len(index), resolution_step(df, resolution) <= pd.Timedelta('15min'))
+    return index - pd.to_timedelta(np.where(single, 15, 0), unit='min')
+
+
+def step_durations(df, resolution=None):
+    """
+    Durée (h) couverte par chaque pas, pour convertir MW en MWh ou en € : Samples_15min x 0.25 h
+    quand la colonne existe (2 h pour l'heure longue d'automne, moins pour les pas incomplets
+    en bord de classeur), sinon la durée nominale du pas.
+    """
+    if 'Samples_15min' in df.columns:
+        return df['Samples_15min'].to_numpy(dtype='float64') * 0.25
+    return np.full(len(df), step_hours(resolution_step(df, resolution)))
+
+
+def step_hours(step):
+    """Durée d'un pas en heures (1.0 en horaire, 0.25 au quart d'heure)."""
+    return step / pd.Timedelta('1h')
+
+
+def rolling_mean(obj, step, window=SMOOTHING_WINDOW):
+    """
+    Moyenne mobile centrée exprimée en durée ('7D') et non en nombre de lignes.
+    Les bords non couverts par une fenêtre complète sont mis à NaN (comme rolling(168)).
+    """
+    smooth = obj.rolling(window, center=True).mean()
+    half = pd.Timedelta(window) / 2
+    index = obj.index
+    covered = (index - half >= index[0]) & (index + half <= index[-1] + step)
+    smooth.iloc[~np.asarray(covered)] = np.nan
+    return smooth
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.generator import SwissGridGenerator
+from src.kpi import winter_gap_kpis
+
+# Quantiles publiés par défaut (P50 = médiane, P95 = année sévère 1 sur 20)
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def _run_chunk(args):
+    # Un bloc de scénarios avec son propre flux aléatoire (SeedSequence.spawn)
+    generator, seed_seq, n = args
+    consumption, production = generator.generate_scenarios(n, rng=np.random.default_rng(seed_seq))
+    kpis = winter_gap_kpis(production, consumption, index=generator.dates())
+    return kpis.to_frame(), kpis.monthly_frame()
+
+
+class ScenarioEngine:
+    """
+    Moteur Monte Carlo : N années synthétiques générées par blocs (tableaux (bloc, 8760)),
+    KPIs calculés sans construire de DataFrame, blocs répartis sur un pool de processus.
+    Les tirages ne dépendent que de `seed` et `chunk_size` (pas du nombre de processus).
+    """
+
+    def __init__(self, generator=None, seed=None, chunk_size=500, workers=None):
+        self.generator = generator or SwissGridGenerator()
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def _chunks(self, n_scenarios):
+        sizes = [self.chunk_size] * (n_scenarios // self.chunk_size)
+        if n_scenarios % self.chunk_size:
+            sizes.append(n_scenarios % self.chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        return [(self.generator, s, n) for s, n in zip(seeds, sizes)]
+
+    def run(self, n_scenarios, monthly=False):
+        """KPIs par scénario (un DataFrame de N lignes), et l'énergie mensuelle si `monthly`."""
+        chunks = self._chunks(n_scenarios)
+        workers = min(self.workers or os.cpu_count(), len(chunks))
+        print(f"Monte Carlo : {n_scenarios} années simulées ({len(chunks)} blocs, {workers} processus)...")
+
+        if workers <= 1:
+            results = [_run_chunk(c) for c in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_run_chunk, chunks))
+
+        kpis = pd.concat([r[0] for r in results], ignore_index=True)
+        if monthly:
+            return kpis, pd.concat([r[1] for r in results], ignore_index=True)
+        return kpis
+
+    @staticmethod
+    def summary(kpis, quantiles=QUANTILES):
+        """Distribution des KPIs : moyenne, écart-type et quantiles (P5/P50/P95...)."""
+        table = kpis.quantile(list(quantiles)).T
+        table.columns = [f'P{q * 100:g}' for q in quantiles]
+        table.insert(0, 'Std', kpis.std())
+        table.insert(0, 'Mean', kpis.mean())
+        return table
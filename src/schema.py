@@ -0,0 +1,122 @@
+import pandas as pd
+import numpy as np
+from src.headers import NEIGHBORS
+from src.resolution import step_durations
+
+# Schéma canonique du DataFrame d'analyse.
+# - dtype : type de stockage compact (float32 pour les puissances/prix, float64 pour les cumuls financiers)
+# - derived : formule si la colonne est dérivée (calculée à la demande, non stockée en mode compact)
+# Tolérance du float32 (~7 chiffres significatifs) par rapport au float64 :
+# < 1e-3 MW sur les puissances (< 10 GW). Sur Net_Revenue_EUR, l'écart d'un pas est
+# proportionnel au volume échangé et au prix (cf. revenue_tolerance_eur), ~0.05 € pour
+# 2 GW à 100 €/MWh. Le cumul (recalculé en float64 sur ces pas) additionne ces écarts :
+# sa borne croît avec le nombre de pas (~4e-4 M€ sur une année horaire de ce type).
+# En pratique les arrondis se compensent en partie : ~2e-6 M€ observés sur un an horaire
+# synthétique, ~6e-6 M€ sur deux.
+FLOAT32_TOLERANCE = {'rtol': 1e-6, 'atol': 1e-3}
+FLOAT32_EPS = 2.0 ** -24  # arrondi relatif maximal d'un float32
+
+
+COLUMNS = {
+    'Production_MW': {'dtype': 'float32', 'derived': None},
+    'Consumption_MW': {'dtype': 'float32', 'derived': None},
+    **{f'Net_Flow_{code}_MW': {'dtype': 'float32', 'derived': None} for code in NEIGHBORS},
+    'Import_Total_MW': {'dtype': 'float32', 'derived': None},
+    'Export_Total_MW': {'dtype': 'float32', 'derived': None},
+    'Transit_MW': {'dtype': 'float32', 'derived': None},
+    'Samples_15min': {'dtype': 'int8', 'derived': None},
+    'Price_EUR': {'dtype': 'float32', 'derived': None},
+    **{f'Price_{code}_EUR': {'dtype': 'float32', 'derived': None} for code in NEIGHBORS},
+    'Residual_Load_MW': {
+        'dtype': 'float32',
+        'derived': lambda df: df['Consumption_MW'] - df['Production_MW'],
+    },
+    'Total_Flux_MW': {
+        'dtype': 'float32',
+        'derived': lambda df: df['Import_Total_MW'] + df['Export_Total_MW'],
+    },
+    'Net_Revenue_EUR': {
+        'dtype': 'float64',
+        # Calcul en float64 dès les entrées (la soustraction float32 ajouterait un arrondi)
+        'derived': lambda df: ((df['Export_Total_MW'].astype('float64') - df['Import_Total_MW'].astype('float64'))
+                               * df['Price_EUR'].astype('float64') * step_durations(df)),
+    },
+    'Revenue_Cumul_Million_EUR': {
+        'dtype': 'float64',
+        'derived': lambda df: df['Net_Revenue_EUR'].cumsum() / 1_000_000,
+    },
+}
+
+DERIVED = [name for name, spec in COLUMNS.items() if spec['derived'] is not None]
+
+# Colonnes nécessaires à chaque colonne dérivée
+DEPENDENCIES = {
+    'Residual_Load_MW': ['Consumption_MW', 'Production_MW'],
+    'Total_Flux_MW': ['Import_Total_MW', 'Export_Total_MW'],
+    'Net_Revenue_EUR': ['Export_Total_MW', 'Import_Total_MW', 'Price_EUR'],
+    'Revenue_Cumul_Million_EUR': ['Net_Revenue_EUR'],
+}
+
+
+def compact(df, drop_derived=False):
+    """
+    Version compacte du DataFrame : colonnes canoniques castées selon le schéma (float32),
+    colonnes dérivées supprimées si `drop_derived` (recalculées par with_derived).
+    Les colonnes hors schéma sont conservées telles quelles.
+    """
+    dtypes = {c: COLUMNS[c]['dtype'] for c in df.columns if c in COLUMNS}
+    df = df.astype(dtypes)
+    if drop_derived:
+        df = df.drop(columns=[c for c in DERIVED if c in df.columns])
+    return df
+
+
+def revenue_tolerance_eur(df):
+    """
+    Borne, pas à pas, de l'écart de Net_Revenue_EUR entre stockage compact (float32) et float64 :
+    2 x eps x (|Export| + |Import|) x |Prix| x durée du pas. L'écart de
+    Revenue_Cumul_Million_EUR est borné par le cumul de ces bornes / 1e6.
+    """
+    volume = df['Export_Total_MW'].abs().astype('float64') + df['Import_Total_MW'].abs().astype('float64')
+    return 2 * FLOAT32_EPS * volume * df['Price_EUR'].abs().astype('float64') * step_durations(df)
+
+
+def with_derived(df, columns=None):
+    """
+    Ajoute les colonnes dérivées manquantes (toutes, ou seulement `columns`) dont les
+    entrées sont disponibles. Ne copie rien si rien ne manque ; ne modifie jamais `df`.
+    """
+    if columns is None:
+        wanted = DERIVED
+    else:
+        # On inclut les dérivées intermédiaires (ex. Net_Revenue_EUR pour le cumul)
+        needed = set(columns)
+        for name in reversed(DERIVED):
+            if name in needed:
+                needed.update(DEPENDENCIES[name])
+        wanted = [c for c in DERIVED if c in needed]
+    new_cols = {}
+    for name in wanted:  # DERIVED est dans l'ordre des dépendances
+        if name in df.columns:
+            continue
+        view = df.assign(**new_cols) if new_cols else df
+        if all(dep in view.columns for dep in DEPENDENCIES[name]):
+            new_cols[name] = COLUMNS[name]['derived'](view).astype(COLUMNS[name]['dtype'])
+    return df.assign(**new_cols) if new_cols else df
+
+
+def border_block(df):
+    """Bloc 2-D (pas, frontières) float32 contigu des flux nets + liste des codes pays."""
+    codes = [code for code in NEIGHBORS if f'Net_Flow_{code}_MW' in df.columns]
+    block = np.ascontiguousarray(df[[f'Net_Flow_{code}_MW' for code in codes]].to_numpy(dtype='float32'))
+    return block, codes
+
+
+def borders_long(df):
+    """Flux nets en format long (Timestamp, Border catégoriel, Net_Flow_MW float32)."""
+    block, codes = border_block(df)
+    return pd.DataFrame({
+        'Timestamp': np.repeat(df.index.to_numpy(), len(codes)),
+        'Border': pd.Categorical(np.tile(codes, len(df)), categories=codes),
+        'Net_Flow_MW': block.ravel(),
+    })
@@ -0,0 +1,116 @@
+import os
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.resolution import step_durations
+from src.kpi import winter_gap_kpis
+
+# Paramètres d'un cas "what-if" (valeurs neutres par défaut)
+# - production_scale / consumption_scale : facteurs multiplicatifs
+# - <profil>_mw : capacité ajoutée (MW) répartie selon un profil normalisé 0..1
+#   ('flat' = bande constante, négative pour une unité à l'arrêt ; 'solar' = profil PV)
+BASE_CASE = {'production_scale': 1.0, 'consumption_scale': 1.0}
+# Colonnes de KPIs d'un cas (WinterGapKPIs.to_frame + bilan financier)
+KPI_COLUMNS = ['Max_Deficit_MW', 'Import_Hours', 'Import_GWh', 'Longest_Deficit_Hours', 'Net_Revenue_Million_EUR']
+
+
+def solar_profile(index):
+    """Facteur de charge PV simplifié (0..1) : cloche diurne, plus longue et haute en été."""
+    index = pd.DatetimeIndex(index)
+    season = -np.cos(2 * np.pi * (index.dayofyear.to_numpy() + 10) / 365.25)  # -1 hiver, +1 été
+    half_day = 4.5 + 2.0 * season  # demi-durée du jour solaire (h)
+    hour = index.hour.to_numpy() + index.minute.to_numpy() / 60 - 12.5
+    bell = np.clip(np.cos(np.pi / 2 * hour / half_day), 0, None)
+    return bell * (0.65 + 0.35 * season) * (np.abs(hour) < half_day)
+
+
+def grid(**axes):
+    """Produit cartésien des valeurs de chaque paramètre -> liste de cas (dicts)."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+_WORKER = None
+
+
+def _init_worker(runner):
+    global _WORKER
+    _WORKER = runner
+
+
+def _evaluate_worker(cases):
+    return _WORKER.evaluate(cases)
+
+
+class SensitivityRunner:
+    """
+    Évaluation vectorisée de cas "what-if" sur le DataFrame du Loader : chaque bloc de
+    cas est un tableau (cas, pas) obtenu par broadcasting, sans copie du DataFrame.
+    KPIs : Winter Gap (noyau src.kpi) et bilan financier (formule Net_Revenue_EUR du
+    Loader, le solde production - consommation ajouté se reportant sur l'export net).
+    """
+
+    def __init__(self, df, profiles=None, resolution=None):
+        self.index = df.index
+        self.hours = step_durations(df, resolution)
+        self.production = df['Production_MW'].to_numpy(dtype='float64')
+        self.consumption = df['Consumption_MW'].to_numpy(dtype='float64')
+        self.net_export = (df['Export_Total_MW'] - df['Import_Total_MW']).to_numpy(dtype='float64') \
+            if {'Export_Total_MW', 'Import_Total_MW'} <= set(df.columns) else self.production - self.consumption
+        self.price = df['Price_EUR'].to_numpy(dtype='float64') if 'Price_EUR' in df.columns \
+            else np.zeros(len(df))
+        self.profiles = {'flat': np.ones(len(df)), 'solar': solar_profile(df.index)}
+        self.profiles.update(profiles or {})
+
+    @property
+    def parameter_names(self):
+        return ['production_scale', 'consumption_scale'] + [f'{p}_mw' for p in self.profiles]
+
+    def _parameters(self, cases):
+        """Cas -> tableau de paramètres (cas x [scales, capacités]) en vérifiant les noms."""
+        names = self.parameter_names
+        unknown = {k for case in cases for k in case} - set(names)
+        if unknown:
+            raise ValueError(f"Paramètres inconnus : {sorted(unknown)} (attendus : {names})")
+        defaults = dict(BASE_CASE, **{f'{p}_mw': 0.0 for p in self.profiles})
+        return np.array([[case.get(n, defaults[n]) for n in names] for case in cases],
+                        dtype='float64').reshape(len(cases), len(names))
+
+    def evaluate(self, cases):
+        """KPIs d'un bloc de cas (un seul tableau (cas, pas) par grandeur)."""
+        params = self._parameters(cases)
+        added = params[:, 2:] @ np.vstack(list(self.profiles.values()))  # (cas, pas) en MW
+        production = params[:, :1] * self.production + added
+        consumption = params[:, 1:2] * self.consumption
+
+        kpis = winter_gap_kpis(production, consumption, index=self.index, hours=self.hours).to_frame()
+        # Bilan financier : (Export - Import + delta) x Prix x h, delta = solde ajouté par le cas
+        delta = (production - self.production) - (consumption - self.consumption)
+        revenue = (self.net_export + delta) @ (self.price * self.hours)
+        kpis['Net_Revenue_Million_EUR'] = revenue / 1_000_000
+        return kpis
+
+    def run(self, cases, chunk_size=256, workers=1):
+        """
+        Évalue tous les cas (liste de dicts, ex. grid(...)) par blocs de `chunk_size`,
+        éventuellement répartis sur un pool de processus. Renvoie une table : une ligne
+        par cas, tous les paramètres (valeurs par défaut comprises) puis les KPIs.
+        """
+        cases = list(cases)
+        # Chaque cas complété par les valeurs par défaut (capacités absentes = 0 MW)
+        table = pd.DataFrame(self._parameters(cases), columns=self.parameter_names)
+        if not cases:
+            return pd.concat([table, pd.DataFrame(columns=KPI_COLUMNS, dtype='float64')], axis=1)
+
+        chunks = [cases[i:i + chunk_size] for i in range(0, len(cases), chunk_size)]
+        workers = min(workers or os.cpu_count(), len(chunks))
+        print(f"Sensibilités : {len(cases)} cas ({len(chunks)} blocs, {workers} processus)...")
+
+        if workers <= 1:
+            results = [self.evaluate(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_evaluate_worker, chunks))
+
+        return pd.concat([table, pd.concat(results, ignore_index=True)], axis=1)
@@ -1,11 +1,20 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+from src.resolution import resolution_step
+from src.derived_cache import get_store
+from src.schema import with_derived
+from src.rendering import finish
+from src.profiling import profiled
+from src.decimation import decimate
 
 class TransitAnalyzer:
-    def __init__(self, df):
-        self.df = df
+    def __init__(self, df, resolution=None):
+        # Total_Flux_MW est dérivée : recalculée si le DataFrame est compact
+        self.df = with_derived(df, ['Total_Flux_MW'])
+        self.step = resolution_step(df, resolution)
 
+    @profiled()
     def plot_total_activity_raw(self):
         """Graphe 1 : Flux Total vs Conso (Brut)"""
         print("Génération Graphe : Flux Total (Brut)...")
@@ -19,21 +28,25 @@ class TransitAnalyzer:
         sns.set_theme(style="whitegrid")
         plt.figure(figsize=(14, 7))
 
-        plt.plot(self.df.index, self.df['Consumption_MW'], label="Consommation", color='#c0392b', lw=0.5, alpha=0.8)
-        plt.plot(self.df.index, self.df['Total_Flux_MW'], label="Flux Total (Imp+Exp)", color='#8e44ad', lw=0.5, alpha=0.8)
+        # Décimation min/max à la largeur de la figure : les pics restent visibles
+        conso = decimate(self.df['Consumption_MW'])
+        flux = decimate(self.df['Total_Flux_MW'])
+        plt.plot(conso.index, conso, label="Consommation", color='#c0392b', lw=0.5, alpha=0.8)
+        plt.plot(flux.index, flux, label="Flux Total (Imp+Exp)", color='#8e44ad', lw=0.5, alpha=0.8)
 
         plt.title("Activité Réseau : Flux Total vs Consommation (Brut 2025)", fontsize=16, fontweight='bold')
         plt.ylabel("Puissance Moyenne (MW)")
         plt.legend(loc='upper right')
         plt.tight_layout()
-        plt.show()
+        finish('FluxTotal_Brut')
 
+    @profiled()
     def plot_total_activity_smoothed(self):
         """Graphe 2 : Flux Total vs Conso (Lissé 7j)"""
         print("Génération Graphe : Flux Total (Lissé)...")
         
         # Lissage direct sur les colonnes MW déjà prêtes
-        df_smooth = self.df[['Consumption_MW', 'Total_Flux_MW']].rolling(window=168, center=True).mean().dropna()
+        df_smooth = get_store(self.df).rolling_frame(['Consumption_MW', 'Total_Flux_MW'], step=self.step).dropna()
 
         plt.figure(figsize=(14, 7))
         plt.plot(df_smooth.index, df_smooth['Consumption_MW'], label="Consommation", color='#c0392b', lw=2)
@@ -46,8 +59,9 @@ class TransitAnalyzer:
         plt.ylabel("Puissance (MW)")
         plt.legend()
         plt.tight_layout()
-        plt.show()
+        finish('FluxTotal_MA7')
 
+    @profiled()
     def plot_pure_transit(self):
         """Graphe 3 : Transit Pur vs Conso (Lissé 7j)"""
         print("Génération Graphe : Transit Pur...")
@@ -56,7 +70,7 @@ class TransitAnalyzer:
             print("⚠️ Pas de colonne Transit_MW.")
             return
 
-        df_smooth = self.df[['Consumption_MW', 'Transit_MW']].rolling(window=168, center=True).mean().dropna()
+        df_smooth = get_store(self.df).rolling_frame(['Consumption_MW', 'Transit_MW'], step=self.step).dropna()
 
         plt.figure(figsize=(14, 7))
         plt.plot(df_smooth.index, df_smooth['Consumption_MW'], label="Consommation", color='#c0392b', lw=2)
@@ -68,4 +82,4 @@ class TransitAnalyzer:
         plt.ylabel("Puissance (MW)")
         plt.legend(loc='upper right')
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        finish('Transit_MA7')
\ No newline at end of file
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from src.resolution import step_durations
+from src.schema import border_block
+
+# Valorisation par frontière, à chaque pas (Net_Flow > 0 = export suisse vers le voisin) :
+# - Revenue_CH : flux x prix suisse (vue "bilan suisse", même convention que Net_Revenue_EUR)
+# - Revenue_Neighbor : flux x prix de la zone voisine
+# - Congestion_Rent : flux x (prix voisin - prix suisse) ; positive quand l'énergie va
+#   de la zone la moins chère vers la plus chère, négative pour un flux "à contre-prix"
+METRICS = ('Net_Flow_GWh', 'Export_GWh', 'Import_GWh',
+           'Revenue_CH_Million_EUR', 'Revenue_Neighbor_Million_EUR', 'Congestion_Rent_Million_EUR')
+
+
+def _group_sums(codes, n_groups, values):
+    """
+    Sommes par (groupe, colonne) d'un tableau (pas, colonnes) en un seul np.bincount
+    sur des codes combinés groupe x colonne : pas de groupby ni de boucle Python.
+    """
+    n_cols = values.shape[1]
+    combined = (codes[:, None] * n_cols + np.arange(n_cols)).ravel()
+    return np.bincount(combined, weights=values.ravel(), minlength=n_groups * n_cols).reshape(n_groups, n_cols)
+
+
+class BorderValuation:
+    """
+    Moteur de valorisation des échanges par frontière : chaque série Net_Flow_{pays}_MW est
+    valorisée pas à pas au prix de la zone voisine (colonnes Price_{pays}_EUR du Loader)
+    et au prix suisse, l'écart de prix donnant la rente de congestion.
+    Tous les calculs se font sur des blocs (pas, frontières) : multi-années sans boucle.
+    Une zone sans prix est valorisée au prix suisse (rente nulle), avec un avertissement.
+    """
+
+    def __init__(self, df, resolution=None):
+        self.index = pd.DatetimeIndex(df.index)
+        self.hours = step_durations(df, resolution)  # durée de chaque pas (h)
+        flows, self.borders = border_block(df)
+        self.flows = flows.astype('float64')
+
+        price_ch = df['Price_EUR'].to_numpy(dtype='float64') if 'Price_EUR' in df.columns \
+            else np.zeros(len(df))
+        missing = [code for code in self.borders if f'Price_{code}_EUR' not in df.columns]
+        if missing:
+            print(f"⚠️ Prix voisins manquants ({', '.join(missing)}) : valorisés au prix suisse.")
+        self.price_ch = price_ch
+        self.prices = np.column_stack([
+            df[f'Price_{code}_EUR'].to_numpy(dtype='float64') if code not in missing else price_ch
+            for code in self.borders
+        ]) if self.borders else np.zeros((len(df), 0))
+
+        # Grandeurs par pas (pas, frontières), en MWh et en €
+        self.energy = self.flows * self.hours[:, None]
+        self.revenue_ch = self.energy * price_ch[:, None]
+        self.revenue_neighbor = self.energy * self.prices
+        self.congestion_rent = self.revenue_neighbor - self.revenue_ch
+
+    def _metrics(self):
+        """Tableau (pas, métriques x frontières) à réduire, dans l'ordre de METRICS (GWh, M€)."""
+        energy = self.energy / 1000
+        return np.concatenate([
+            energy,
+            np.maximum(energy, 0),
+            np.maximum(-energy, 0),
+            self.revenue_ch / 1e6,
+            self.revenue_neighbor / 1e6,
+            self.congestion_rent / 1e6,
+        ], axis=1)
+
+    def _tidy(self, sums, keys, key_name):
+        """(groupes, métriques x frontières) -> table longue : une ligne par (groupe, frontière)."""
+        n_groups, n_borders = len(keys), len(self.borders)
+        table = pd.DataFrame({
+            key_name: np.repeat(keys, n_borders),
+            'Border': np.tile(self.borders, n_groups),
+        })
+        blocks = sums.reshape(n_groups, len(METRICS), n_borders)
+        for i, name in enumerate(METRICS):
+            table[name] = blocks[:, i, :].ravel()
+        return table
+
+    def by_border(self):
+        """Totaux sur toute la période, une ligne par frontière."""
+        sums = self._metrics().sum(axis=0)[None, :]
+        return self._tidy(sums, ['Total'], 'Period').drop(columns='Period').set_index('Border')
+
+    def by_month(self):
+        """Totaux par mois (Period) et par frontière, sur toutes les années."""
+        months, codes = np.unique(self.index.year * 12 + self.index.month - 1, return_inverse=True)
+        sums = _group_sums(codes, len(months), self._metrics())
+        labels = pd.PeriodIndex.from_fields(year=months // 12, month=months % 12 + 1, freq='M')
+        return self._tidy(sums, labels, 'Month')
+
+    def by_hour(self):
+        """Totaux par heure de la journée (0-23) et par frontière, toutes années confondues."""
+        sums = _group_sums(self.index.hour.to_numpy(), 24, self._metrics())
+        return self._tidy(sums, np.arange(24), 'Hour')
+
+    def hourly(self):
+        """Série par pas : Revenue_{pays}_EUR (prix suisse) et Congestion_Rent_{pays}_EUR."""
+        columns = {}
+        for i, code in enumerate(self.borders):
+            columns[f'Revenue_{code}_EUR'] = self.revenue_ch[:, i]
+            columns[f'Congestion_Rent_{code}_EUR'] = self.congestion_rent[:, i]
+        return pd.DataFrame(columns, index=self.index)
+
+    def report(self):
+        table = self.by_border()
+        print(f"\n--- VALORISATION PAR FRONTIÈRE ---")
+        print(table[['Export_GWh', 'Import_GWh', 'Revenue_CH_Million_EUR', 'Congestion_Rent_Million_EUR']]
+              .round(1).to_string())
+        print(f"Bilan des frontières (prix CH) : {table['Revenue_CH_Million_EUR'].sum():+.1f} M€ "
+              f"| Rente de congestion : {table['Congestion_Rent_Million_EUR'].sum():+.1f} M€")
+        return table
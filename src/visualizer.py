@@ -1,22 +1,33 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.resolution import resolution_step
+from src.derived_cache import get_store
+from src.rendering import finish
+from src.profiling import profiled
+from src.decimation import decimate
 
 class SwissGridVisualizer:
-    def __init__(self, df):
+    def __init__(self, df, resolution=None):
         self.df = df
+        # Pas de temps ('h', '15min' ou déduit de l'index)
+        self.step = resolution_step(df, resolution)
         # On définit le style général une bonne fois pour toutes
         sns.set_theme(style="whitegrid")
 
+    @profiled()
     def plot_raw_data(self):
         """
-        MODE BRUT : Affiche chaque heure (8760 points).
+        MODE BRUT : Affiche chaque pas (8760 points/an en horaire, 35 040 au quart d'heure).
         Utile pour voir la volatilité, les pics extrêmes et le "bruit" du marché.
         """
         plt.figure(figsize=(14, 7))
         
         # Tracé fin (linewidth=0.5) car il y a beaucoup de points
-        plt.plot(self.df.index, self.df['Consumption_MW'], label='Conso (Brute)', color='#c0392b', lw=0.5, alpha=0.8)
-        plt.plot(self.df.index, self.df['Production_MW'], label='Prod (Brute)', color='#27ae60', lw=0.5, alpha=0.8)
+        # Décimation min/max à la largeur de la figure : les pics restent visibles
+        conso = decimate(self.df['Consumption_MW'])
+        prod = decimate(self.df['Production_MW'])
+        plt.plot(conso.index, conso, label='Conso (Brute)', color='#c0392b', lw=0.5, alpha=0.8)
+        plt.plot(prod.index, prod, label='Prod (Brute)', color='#27ae60', lw=0.5, alpha=0.8)
 
         plt.title("Vue Technique : Volatilité Horaire du Réseau Suisse (2025)", fontsize=14, fontweight='bold')
         plt.ylabel("Puissance (MW)")
@@ -25,17 +36,19 @@ class SwissGridVisualizer:
         plt.tight_layout()
         
         print("Graphe BRUT généré (ferme la fenêtre pour voir le suivant).")
-        plt.show()
+        finish('WinterGap_Brut')
 
+    @profiled()
     def plot_smoothed_trend(self):
         """
-        MODE LISSÉ : Moyenne mobile sur 7 jours (168h).
+        MODE LISSÉ : Moyenne mobile sur 7 jours (fenêtre en durée, indépendante de la résolution).
         Utile pour voir le 'Winter Gap', les tendances saisonnières et les déficits structurels.
         """
         # Calcul de la moyenne glissante (Rolling Mean)
-        # window=168 : On prend 168h (7 jours)
+        # window='7D' : On prend 7 jours (168 lignes en horaire, 672 au quart d'heure)
         # center=True : On place le point au milieu de la semaine (pour ne pas décaler la courbe visuellement)
-        df_smooth = self.df.rolling(window=168, center=True).mean()
+        # (seules les colonnes tracées, via le store partagé entre analyseurs)
+        df_smooth = get_store(self.df).rolling_frame(['Consumption_MW', 'Production_MW'], step=self.step)
 
         plt.figure(figsize=(14, 7))
 
@@ -63,4 +76,4 @@ class SwissGridVisualizer:
         plt.tight_layout()
         
         print("Graphe LISSÉ généré.")
-        plt.show()
\ No newline at end of file
+        finish('WinterGap_MA7')
\ No newline at end of file
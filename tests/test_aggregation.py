@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.fixtures import HEADERS, synthetic_year
+from src.aggregation import aggregate_power
+from src.headers import resolve_swissgrid_columns
+from src.kpi import winter_gap_kpis
+from src.loader import SwissGridLoader
+from src.resolution import step_durations
+
+
+@pytest.fixture(scope='module')
+def year_2024():
+    labels, kwh = synthetic_year(2024, np.random.default_rng(0))
+    columns = resolve_swissgrid_columns(HEADERS)
+    positions = [pos - 1 for pos in columns.values()]  # colonne 0 = horodatage
+    return pd.DataFrame(kwh[:, positions], index=labels, columns=list(columns))
+
+
+@pytest.mark.parametrize('freq', ['h', '15min'])
+def test_energy_conserved_over_year(year_2024, freq):
+    index, mw, counts, expected = aggregate_power(year_2024.index, year_2024.to_numpy(), freq=freq)
+    assert counts.sum() == len(year_2024)
+    energy_kwh = (mw * counts[:, None] * 0.25 * 1000).sum(axis=0)
+    np.testing.assert_allclose(energy_kwh, year_2024.sum().to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('day', ['2024-03-31', '2024-10-27'])
+def test_energy_conserved_over_dst_days(year_2024, day):
+    raw = year_2024[(year_2024.index > pd.Timestamp(day)) & (year_2024.index <= pd.Timestamp(day) + pd.Timedelta('1D'))]
+    df = SwissGridLoader('unused.xlsx', None, use_cache=False)._build_power_frame(raw)
+    hours = step_durations(df)
+    assert hours.sum() == len(raw) * 0.25  # 23 h au printemps, 25 h en automne
+
+    # Énergie des flux et du déficit pondérée par Samples_15min x 0.25 h
+    np.testing.assert_allclose((df['Import_Total_MW'] * hours).sum() * 1000, raw['Import_Total_kWh'].sum())
+    deficit_mw = (df['Consumption_MW'] - df['Production_MW']).clip(lower=0)
+    kpis = winter_gap_kpis(df['Production_MW'].to_numpy(), df['Consumption_MW'].to_numpy(),
+                           index=df.index, hours=hours)
+    np.testing.assert_allclose(kpis.import_gwh, (deficit_mw * hours).sum() / 1000)
+    assert kpis.total_hours == len(raw) * 0.25
+
+
+def test_long_autumn_hour(year_2024):
+    index, mw, counts, expected = aggregate_power(year_2024.index, year_2024.to_numpy())
+    hours = pd.Series(counts, index=index)
+    assert hours[pd.Timestamp('2024-10-27 02:00')] == 8
+    assert pd.Timestamp('2024-03-31 02:00') not in hours.index
+    # Pas irréguliers : seulement les bords du classeur (00:00 partiel au début et à la fin)
+    assert list(index[counts != expected]) == [pd.Timestamp('2024-01-01'), pd.Timestamp('2025-01-01')]
@@ -0,0 +1,25 @@
+import os
+import pandas as pd
+from src.cache import ParquetCache
+
+
+def test_store_keeps_other_engine_and_drops_stale_entries(tmp_path):
+    source = tmp_path / 'swissgrid_2024.xlsx'
+    source.write_bytes(b'v1')
+    cache = ParquetCache(str(tmp_path / '.cache'))
+    df = pd.DataFrame({'Production_kWh': [1.0, 2.0]})
+
+    cache.store(str(source), '2-streaming', df)
+    cache.store(str(source), '3-streaming', df)
+    cache.store(str(source), '3-pandas', df)
+    # Les deux moteurs coexistent ; l'ancienne version du parser est supprimée
+    assert cache.load(str(source), '3-streaming') is not None
+    assert cache.load(str(source), '3-pandas') is not None
+    assert cache.load(str(source), '2-streaming') is None
+
+    # Nouveau contenu : les entrées de l'ancien classeur disparaissent, tous moteurs confondus
+    source.write_bytes(b'v2')
+    os.utime(source, (1, 1))
+    cache.store(str(source), '3-pandas', df)
+    assert len([f for f in os.listdir(tmp_path / '.cache') if f.endswith('.parquet')]) == 1
+    assert cache.load(str(source), '3-streaming') is None
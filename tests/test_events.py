@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from benchmarks.fixtures import HEADERS, synthetic_year
+from src.events import EventDetector
+from src.headers import resolve_swissgrid_columns
+from src.loader import SwissGridLoader
+
+
+def hourly_frame(year):
+    labels, kwh = synthetic_year(year, np.random.default_rng(0))
+    columns = resolve_swissgrid_columns(HEADERS)
+    raw = pd.DataFrame(kwh[:, [pos - 1 for pos in columns.values()]], index=labels, columns=list(columns))
+    return SwissGridLoader('unused.xlsx', None, use_cache=False)._build_power_frame(raw)
+
+
+def test_deficit_episode_spans_dst_changes():
+    df = hourly_frame(2024)
+    df = df.assign(Consumption_MW=df['Production_MW'] + 1000, Residual_Load_MW=1000.0)
+    events = EventDetector(df).above('Residual_Load_MW', 0)
+    # Un seul épisode sur toute l'année : ni le saut de printemps ni l'heure longue ne le coupent
+    assert len(events) == 1
+    hours = df['Samples_15min'].sum() * 0.25
+    assert events['Duration_Hours'].iloc[0] == hours
+    np.testing.assert_allclose(events['Excess_MWh'].iloc[0], 1000 * hours)
+
+
+def test_real_hole_still_cuts_episode():
+    df = hourly_frame(2024)
+    df = df.assign(Residual_Load_MW=1000.0).drop(pd.Timestamp('2024-06-01 12:00'))
+    assert len(EventDetector(df).above('Residual_Load_MW', 0)) == 2
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.fixtures import quarter_hour_labels, synthetic_year, write_prices, write_workbook
+from src.loader import MultiYearLoader, SwissGridLoader
+
+COLUMNS = ['Production_MW', 'Consumption_MW', 'Import_Total_MW', 'Export_Total_MW', 'Samples_15min',
+           'Price_EUR', 'Revenue_Cumul_Million_EUR']
+
+
+@pytest.fixture(scope='module')
+def year_2006():
+    return synthetic_year(2006, np.random.default_rng(0))
+
+
+@pytest.fixture
+def prices(tmp_path):
+    path = tmp_path / 'prices.csv'
+    write_prices(path, [2006, 2007], np.random.default_rng(1))
+    return str(path)
+
+
+def spy_rows(loader):
+    """Nombre de quarts d'heure lus par chaque appel à _parse_swissgrid_excel."""
+    calls, parse = [], loader._parse_swissgrid_excel
+
+    def wrapper(min_row=2):
+        df = parse(min_row=min_row)
+        calls.append(len(df))
+        return df
+    loader._parse_swissgrid_excel = wrapper
+    return calls
+
+
+def assert_same(updated, full):
+    assert updated.index.equals(full.index)
+    pd.testing.assert_frame_equal(updated[COLUMNS], full[COLUMNS], check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize('engine', ['streaming', 'pandas'])
+def test_update_single_workbook(tmp_path, year_2006, prices, engine):
+    labels, kwh = year_2006
+    workbook = str(tmp_path / 'swissgrid.xlsx')
+    write_workbook(workbook, labels[:3 * 96], kwh[:3 * 96])
+    loader = SwissGridLoader(workbook, prices, use_cache=False, engine=engine)
+    loader.load_data()
+
+    # Classeur re-téléchargé avec deux jours de plus
+    write_workbook(workbook, labels[:5 * 96], kwh[:5 * 96])
+    calls = spy_rows(loader)
+    updated = loader.update()
+
+    full = SwissGridLoader(workbook, prices, use_cache=False, engine=engine).load_data()
+    assert_same(updated, full)
+    # Incrémental : seule la fin de la feuille est relue
+    assert calls and calls[0] < 3 * 96
+
+
+@pytest.mark.parametrize('engine', ['streaming', 'pandas'])
+def test_update_multi_year(tmp_path, year_2006, prices, engine):
+    labels, kwh = year_2006
+    labels_2007 = quarter_hour_labels(2007)
+    kwh_2007 = kwh[:len(labels_2007)][::-1]
+    write_workbook(str(tmp_path / 'swissgrid_2006.xlsx'), labels[-2 * 96:], kwh[-2 * 96:])
+    write_workbook(str(tmp_path / 'swissgrid_2007.xlsx'), labels_2007[:3 * 96], kwh_2007[:3 * 96])
+    loader = MultiYearLoader(str(tmp_path), prices, workers=1, use_cache=False, engine=engine)
+    loader.load_data()
+
+    write_workbook(str(tmp_path / 'swissgrid_2007.xlsx'), labels_2007[:5 * 96], kwh_2007[:5 * 96])
+    calls = spy_rows(loader)
+    updated = loader.update()
+
+    full = MultiYearLoader(str(tmp_path), prices, workers=1, use_cache=False, engine=engine).load_data()
+    assert_same(updated, full)
+    assert calls and calls[0] < 3 * 96
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from src.schema import compact, revenue_tolerance_eur, with_derived
+
+
+def test_compact_revenue_within_documented_tolerance():
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-01', periods=2 * 8760, freq='h')
+    imports, exports = rng.uniform(0, 6000, (2, len(index)))
+    df = with_derived(pd.DataFrame({
+        'Production_MW': rng.uniform(3000, 9000, len(index)),
+        'Consumption_MW': rng.uniform(5000, 10000, len(index)),
+        'Import_Total_MW': imports, 'Export_Total_MW': exports,
+        'Price_EUR': rng.uniform(-50, 400, len(index)),
+    }, index=index))
+
+    restored = with_derived(compact(df, drop_derived=True))
+    bound = revenue_tolerance_eur(df)
+    step_error = (restored['Net_Revenue_EUR'] - df['Net_Revenue_EUR']).abs()
+    cumul_error = (restored['Revenue_Cumul_Million_EUR'] - df['Revenue_Cumul_Million_EUR']).abs()
+    assert (step_error <= bound).all()
+    assert (cumul_error <= bound.cumsum() / 1_000_000).all()